@@ -1,24 +1,27 @@
-"""Advanced RXTE analysis features."""
+"""Advanced RXTE analysis features.
 
-from autorxte.advanced.color_color_01 import extract_color_ranges, plot_color_diagrams
-from autorxte.advanced.xspec_fit_02 import (
-    fit_all_spectra,
-    apply_xcm_template,
-    rewrite_xcm_paths,
-    parse_xspec_log,
-)
-from autorxte.advanced.xenon_mode_03 import (
-    create_xenon_god_files,
-    move_xenon_god_files,
-    run_make_se,
-    create_xenon_event_lists,
-    xenon_complete_workflow
-)
-from autorxte.advanced.plotting_04 import (
-    plot_single_lightcurve,
-    plot_all_lightcurves,
-    plot_multiple_lightcurves,
-)
+Submodules are imported on first attribute access (PEP 562), like
+autorxte.core.
+"""
+import importlib
+
+# Public name -> submodule that defines it.
+_EXPORTS = {
+    'extract_color_ranges': 'color_color_01',
+    'plot_color_diagrams': 'color_color_01',
+    'fit_all_spectra': 'xspec_fit_02',
+    'apply_xcm_template': 'xspec_fit_02',
+    'rewrite_xcm_paths': 'xspec_fit_02',
+    'parse_xspec_log': 'xspec_fit_02',
+    'create_xenon_god_files': 'xenon_mode_03',
+    'move_xenon_god_files': 'xenon_mode_03',
+    'run_make_se': 'xenon_mode_03',
+    'create_xenon_event_lists': 'xenon_mode_03',
+    'xenon_complete_workflow': 'xenon_mode_03',
+    'plot_single_lightcurve': 'plotting_04',
+    'plot_all_lightcurves': 'plotting_04',
+    'plot_multiple_lightcurves': 'plotting_04',
+}
 
 __all__ = [
     'extract_color_ranges',
@@ -36,3 +39,16 @@ __all__ = [
     'plot_all_lightcurves',
     'plot_multiple_lightcurves',
 ]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -11,27 +11,59 @@ for the channel-to-keV translation.
 """
 import logging
 import multiprocessing
-import re
+import os
 from pathlib import Path
 from typing import Optional, List
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from autorxte.utils import run_heasoft_pty, HEASoftToolError, require_heasoft_tool
+from autorxte.utils import (
+    run_heasoft_pty, HEASoftToolError, require_heasoft_tool, find_results_dirs,
+)
 from autorxte.utils.interactive import get_path, get_input, get_int, get_yes_no
 
 logger = logging.getLogger(__name__)
 
-OBSID_RE = re.compile(r'^\d{5}-\d{2}-\d{2}-\d{2}[A-Z]?$')
-
 DEFAULT_RANGES = ['0-13', '14-35', '36-255']
 DEFAULT_NAMES = ['soft', 'medium', 'hard']
 DEFAULT_BITMASK = 'bitmask_event'  # written by `bitmask` step
 
-
-def _is_results_dir_for_obsid(entry: Path) -> bool:
-    if not entry.is_dir() or not entry.name.endswith('-results'):
+# seextrct stdin script: same shape as extraction_06 except one of the
+# trailing INDEFs is replaced by the channel range. Total 18 stdin lines.
+_SEEXTRCT_TMPL = (
+    "@{infile}\n"
+    "-\n"
+    "{gti}\n"
+    "{out}\n"
+    "{bitmask}\n"
+    "TIME\n"
+    "EVENT\n"
+    "{bin_size}\n"
+    "LIGHTCURVE\n"
+    "RATE\n"
+    "SUM\n"
+    + "INDEF\n" * 5
+    + "{erange}\n"
+    "INDEF\n"
+)
+
+# Successful tasks are logged in groups of this many, one line per group.
+OK_LOG_BATCH = 32
+
+
+def _newer_than(out: Path, inputs: List[Path]) -> bool:
+    """True if `out` exists, is non-empty and is at least as new as every input."""
+    try:
+        st = out.stat()
+    except FileNotFoundError:
         return False
-    return bool(OBSID_RE.match(entry.name[:-len('-results')]))
+    return st.st_size > 0 and st.st_mtime >= max(p.stat().st_mtime for p in inputs)
+
+
+def _hardcopy_name(plot_device: str) -> Optional[str]:
+    """File a PGPLOT device like 'ccd_plot.png/png' writes, or None for
+    screen/null devices ('/null', '/xw')."""
+    name = plot_device.rsplit('/', 1)[0] if '/' in plot_device else ''
+    return name or None
 
 
 def extract_color_range(
@@ -46,19 +78,14 @@ def extract_color_range(
     lc_file = analysis / f"{color_name}.lc"
     bitmask_path = analysis / bitmask_name
 
-    # seextrct script: same shape as extraction_06 except one of the trailing
-    # INDEFs is replaced by the channel range. Total 18 stdin lines.
-    script_lines = [
-        f"@{results_dir}/{infile_rel}",
-        "-",
-        str(gti_file),
-        str(evpath),
-        str(bitmask_path),
-        "TIME", "EVENT",
-        bin_size,
-        "LIGHTCURVE", "RATE", "SUM",
-    ] + (["INDEF"] * 5) + [energy_range, "INDEF"]
-    script = "\n".join(script_lines) + "\n"
+    script = _SEEXTRCT_TMPL.format(
+        infile=f"{results_dir}/{infile_rel}",
+        gti=gti_file,
+        out=evpath,
+        bitmask=bitmask_path,
+        bin_size=bin_size,
+        erange=energy_range,
+    )
 
     try:
         run_heasoft_pty(
@@ -94,15 +121,20 @@ def extract_color_ranges(
         bitmask = get_input("Bitmask filename", DEFAULT_BITMASK, bitmask)
         bin_size = get_input("Time bin size (seconds)", "0.04", bin_size)
 
-        n_ranges = get_int("Number of energy bands", 3, len(ranges) if ranges else None)
-        ranges_l = []
-        names_l = []
-        for i in range(n_ranges):
-            default_range = DEFAULT_RANGES[i] if i < len(DEFAULT_RANGES) else f"{i*10}-{(i+1)*10}"
-            default_name = DEFAULT_NAMES[i] if i < len(DEFAULT_NAMES) else f"color{i+1}"
-            ranges_l.append(get_input(f"Range {i+1} (channel IDs, e.g. 0-13)", default_range))
-            names_l.append(get_input(f"Name {i+1}", default_name))
-        ranges, names = ranges_l, names_l
+        # Bands given in full (same number of ranges and names) need no prompts.
+        if not (ranges and names and len(ranges) == len(names)):
+            n_ranges = get_int("Number of energy bands", 3, len(ranges) if ranges else None)
+            default_ranges = DEFAULT_RANGES + [
+                f"{i*10}-{(i+1)*10}" for i in range(len(DEFAULT_RANGES), n_ranges)
+            ]
+            default_names = DEFAULT_NAMES + [
+                f"color{i+1}" for i in range(len(DEFAULT_NAMES), n_ranges)
+            ]
+            ranges, names = [], []
+            for i in range(n_ranges):
+                ranges.append(get_input(f"Range {i+1} (channel IDs, e.g. 0-13)",
+                                        default_ranges[i]))
+                names.append(get_input(f"Name {i+1}", default_names[i]))
 
         workers = get_int("Parallel workers", multiprocessing.cpu_count(), workers)
         skip_existing = get_yes_no(
@@ -126,6 +158,15 @@ def extract_color_ranges(
             f"(got {len(ranges)} ranges, {len(names)} names)"
         )
 
+    # Two bands with the same name would write the same <name>.lc
+    # concurrently; keep the first.
+    bands = {}
+    for color_name, energy_range in zip(names, ranges):
+        if color_name in bands:
+            logger.warning(f"Duplicate band name {color_name!r}; ignoring range {energy_range}")
+            continue
+        bands[color_name] = energy_range
+
     seext_cwd = root_dir.parent.resolve()
 
     infile_rel = (
@@ -134,9 +175,7 @@ def extract_color_ranges(
     )
 
     tasks = []
-    for results_dir in sorted(root_dir.iterdir()):
-        if not _is_results_dir_for_obsid(results_dir):
-            continue
+    for results_dir in find_results_dirs(root_dir):
         analysis = results_dir / "Analysis"
         if not analysis.is_dir():
             logger.warning(f"{results_dir.name}: no Analysis/; skip")
@@ -152,9 +191,12 @@ def extract_color_ranges(
             logger.warning(f"{results_dir.name}: missing {infile_rel}; run 'organize' first")
             continue
 
-        for color_name, energy_range in zip(names, ranges):
+        # Make-style check: an existing band lightcurve only counts as done
+        # if it is newer than the GTI, bitmask and event list it came from.
+        inputs = [gti_file, analysis / bitmask, results_dir / infile_rel]
+        for color_name, energy_range in bands.items():
             lc_file = analysis / f"{color_name}.lc"
-            if skip_existing and lc_file.exists() and lc_file.stat().st_size > 0:
+            if skip_existing and _newer_than(lc_file, inputs):
                 logger.info(f"SKIP {results_dir.name[:-len('-results')]}/{color_name}")
                 continue
             tasks.append((
@@ -173,15 +215,22 @@ def extract_color_ranges(
         futures = {
             executor.submit(extract_color_range, *task): task for task in tasks
         }
+        ok: List[str] = []
         for fut in as_completed(futures):
             try:
-                logger.info(f"OK   {fut.result()}")
+                ok.append(fut.result())
             except HEASoftToolError:
+                # Already logged by extract_color_range.
                 failures += 1
             except Exception as e:
                 task = futures[fut]
                 logger.error(f"FAIL {task[0].name}/{task[3]}: {type(e).__name__}: {e}")
                 failures += 1
+            if len(ok) >= OK_LOG_BATCH:
+                logger.info(f"OK   {', '.join(ok)}")
+                ok.clear()
+        if ok:
+            logger.info(f"OK   {', '.join(ok)}")
 
     if failures:
         logger.warning(f"Done with {failures}/{len(tasks)} failures.")
@@ -189,15 +238,55 @@ def extract_color_ranges(
         logger.info(f"Done. Extracted {len(tasks)} color lightcurves.")
 
 
+def plot_single_diagram(
+    results_dir: Path, color_names: List[str], bin_size: str, plot_device: str,
+) -> str:
+    """Run lcurve over the per-band lightcurves of one obsid. Returns the obsid."""
+    obsid = results_dir.name[:-len('-results')]
+    analysis = results_dir / "Analysis"
+    color_files = [f"{name}.lc" for name in color_names]
+    try:
+        present = set(os.listdir(analysis))
+    except FileNotFoundError:
+        raise FileNotFoundError(f"{obsid}: no Analysis/")
+    for cf in color_files:
+        if cf not in present:
+            raise FileNotFoundError(f"{obsid}: missing Analysis/{cf}")
+
+    lines = [str(len(color_files))] + color_files + [
+        "-", bin_size, "2000000", "out", "yes",
+        plot_device, "1", "q",
+    ]
+    script = "\n".join(lines) + "\n"
+
+    try:
+        run_heasoft_pty(
+            ['lcurve'],
+            input_text=script,
+            cwd=analysis,
+            timeout=300,
+        )
+        return obsid
+    except HEASoftToolError as e:
+        logger.error(f"FAIL {obsid}: {e}")
+        raise
+
+
 def plot_color_diagrams(
     root_dir: Optional[Path] = None,
     color_names: Optional[List[str]] = None,
     bin_size: Optional[str] = None,
     plot_device: Optional[str] = None,
     workers: Optional[int] = None,
+    skip_existing: Optional[bool] = None,
     interactive: bool = True,
 ):
-    """Plot per-obsid color-color diagrams using lcurve."""
+    """Plot per-obsid color-color diagrams using lcurve.
+
+    When plot_device writes a file (e.g. ccd_plot.png/png) and
+    skip_existing is on, obsids whose Analysis/<file> is newer than all of
+    their color lightcurves are skipped.
+    """
     require_heasoft_tool('lcurve')
 
     if interactive:
@@ -214,47 +303,35 @@ def plot_color_diagrams(
             "/null", plot_device,
         )
         workers = get_int("Workers", multiprocessing.cpu_count(), workers)
+        if _hardcopy_name(plot_device):
+            skip_existing = get_yes_no(
+                "Skip obsids whose plot is newer than their lightcurves?",
+                True, skip_existing,
+            )
     else:
         root_dir = root_dir or Path('.')
         color_names = color_names or DEFAULT_NAMES
         bin_size = bin_size or "-1"
         plot_device = plot_device or "/null"
         workers = workers or multiprocessing.cpu_count()
+    skip_existing = skip_existing if skip_existing is not None else True
 
     if not root_dir.is_dir():
         raise ValueError(f"Root directory does not exist: {root_dir}")
 
-    def plot_single_diagram(results_dir: Path) -> str:
-        obsid = results_dir.name[:-len('-results')]
-        analysis = results_dir / "Analysis"
-        color_files = [f"{name}.lc" for name in color_names]
-        for cf in color_files:
-            if not (analysis / cf).exists():
-                raise FileNotFoundError(f"{obsid}: missing Analysis/{cf}")
-
-        lines = [str(len(color_files))] + color_files + [
-            "-", bin_size, "2000000", "out", "yes",
-            plot_device, "1",
-        ]
-        if plot_device != "/null":
-            lines.append("q")
-        else:
-            lines.append("q")
-        script = "\n".join(lines) + "\n"
-
-        try:
-            run_heasoft_pty(
-                ['lcurve'],
-                input_text=script,
-                cwd=analysis,
-                timeout=300,
-            )
-            return obsid
-        except HEASoftToolError as e:
-            logger.error(f"FAIL {obsid}: {e}")
-            raise
+    dirs = find_results_dirs(root_dir)
 
-    dirs = [d for d in sorted(root_dir.iterdir()) if _is_results_dir_for_obsid(d)]
+    hardcopy = _hardcopy_name(plot_device)
+    if skip_existing and hardcopy:
+        todo = []
+        for d in dirs:
+            analysis = d / "Analysis"
+            lcs = [analysis / f"{name}.lc" for name in color_names]
+            if all(lc.exists() for lc in lcs) and _newer_than(analysis / hardcopy, lcs):
+                logger.info(f"SKIP {d.name[:-len('-results')]} ({hardcopy} up to date)")
+                continue
+            todo.append(d)
+        dirs = todo
     if not dirs:
         logger.warning("No <obsid>-results directories found.")
         return
@@ -262,11 +339,18 @@ def plot_color_diagrams(
     logger.info(f"Plotting {len(dirs)} color-color diagrams with {workers} workers")
     failures = 0
     with ThreadPoolExecutor(max_workers=workers) as executor:
-        futures = {executor.submit(plot_single_diagram, d): d for d in dirs}
+        futures = {
+            executor.submit(plot_single_diagram, d, color_names, bin_size, plot_device): d
+            for d in dirs
+        }
         for fut in as_completed(futures):
             try:
                 logger.info(f"OK   {fut.result()}")
-            except (HEASoftToolError, FileNotFoundError):
+            except HEASoftToolError:
+                # Already logged by plot_single_diagram.
+                failures += 1
+            except FileNotFoundError as e:
+                logger.error(f"FAIL {e}")
                 failures += 1
             except Exception as e:
                 d = futures[fut]
@@ -303,6 +387,7 @@ if __name__ == '__main__':
     plt.add_argument('--bin-size')
     plt.add_argument('--plot-device')
     plt.add_argument('--workers', type=int)
+    plt.add_argument('--no-skip-existing', action='store_true')
     plt.add_argument('--no-interactive', action='store_true')
 
     args = parser.parse_args()
@@ -321,6 +406,7 @@ if __name__ == '__main__':
             args.directory,
             color_names=args.colors, bin_size=args.bin_size,
             plot_device=args.plot_device, workers=args.workers,
+            skip_existing=False if args.no_skip_existing else None,
             interactive=not args.no_interactive,
         )
     else:
@@ -10,23 +10,19 @@ the primary downstream artefact and is unaffected.
 """
 import logging
 import multiprocessing
-import re
 from pathlib import Path
 from typing import Optional, List
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from autorxte.utils import run_heasoft_pty, HEASoftToolError, require_heasoft_tool
+from autorxte.utils import (
+    run_heasoft_pty, HEASoftToolError, require_heasoft_tool, find_results_dirs,
+)
 from autorxte.utils.interactive import get_path, get_input, get_int
 
 logger = logging.getLogger(__name__)
 
-OBSID_RE = re.compile(r'^\d{5}-\d{2}-\d{2}-\d{2}[A-Z]?$')
-
-
-def _is_results_dir_for_obsid(entry: Path) -> bool:
-    if not entry.is_dir() or not entry.name.endswith('-results'):
-        return False
-    return bool(OBSID_RE.match(entry.name[:-len('-results')]))
+# Successful plots are logged in groups of this many, one line per group.
+OK_LOG_BATCH = 32
 
 
 def plot_single_lightcurve(
@@ -97,9 +93,7 @@ def plot_all_lightcurves(
         raise ValueError(f"Root directory does not exist: {root_dir}")
 
     lc_files: List[Path] = []
-    for results_dir in sorted(root_dir.iterdir()):
-        if not _is_results_dir_for_obsid(results_dir):
-            continue
+    for results_dir in find_results_dirs(root_dir):
         analysis = results_dir / "Analysis"
         if analysis.is_dir():
             lc_files.extend(sorted(analysis.glob(lc_pattern)))
@@ -116,16 +110,30 @@ def plot_all_lightcurves(
             executor.submit(plot_single_lightcurve, lc, bin_size, "10000", plot_device): lc
             for lc in lc_files
         }
-        for fut in as_completed(futures):
-            lc = futures[fut]
-            try:
-                fut.result()
-                logger.info(f"OK   {lc.parent.parent.name}/{lc.name}")
-            except (HEASoftToolError, FileNotFoundError):
-                failures += 1
-            except Exception as e:
-                logger.error(f"FAIL {lc.name}: {type(e).__name__}: {e}")
-                failures += 1
+        ok: List[str] = []
+        try:
+            for fut in as_completed(futures):
+                lc = futures[fut]
+                try:
+                    fut.result()
+                    ok.append(f"{lc.parent.parent.name}/{lc.name}")
+                except (HEASoftToolError, FileNotFoundError):
+                    failures += 1
+                except Exception as e:
+                    logger.error(f"FAIL {lc.name}: {type(e).__name__}: {e}")
+                    failures += 1
+                if len(ok) >= OK_LOG_BATCH:
+                    logger.info(f"OK   {', '.join(ok)}")
+                    ok.clear()
+        except KeyboardInterrupt:
+            # Drop queued plots so the executor only waits for the lcurve
+            # runs already in flight instead of draining the whole queue.
+            for fut in futures:
+                fut.cancel()
+            raise
+        finally:
+            if ok:
+                logger.info(f"OK   {', '.join(ok)}")
 
     if failures:
         logger.warning(f"Done with {failures}/{len(lc_files)} failures.")
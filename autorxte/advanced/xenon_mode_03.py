@@ -7,116 +7,281 @@ Complete preprocessing for Good Xenon mode data, including:
 
 Based on: xenongod.py, make_se.txt, xenon_move.txt, xenonlist.txt
 """
+import json
 import logging
+import multiprocessing
+import os
+import shlex
 import subprocess
 import shutil
-import gzip
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Dict, List, Union
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 import astropy.io.fits as fits
-from autorxte.utils import require_heasoft_tool, run_heasoft_pty, HEASoftToolError
-from autorxte.utils.interactive import get_path, get_input, get_yes_no
+from autorxte.utils import (
+    require_heasoft_tool, run_heasoft_pty, HEASoftToolError, find_results_dirs,
+)
+from autorxte.utils.interactive import get_path, get_input, get_int, get_yes_no
 
 logger = logging.getLogger(__name__)
 
-def read_fits_header_xenon(file_path: Path, extension: str = 'XTE_SP'):
-    """Read DATAMODE and DDESC from Xenon FITS file."""
+# Per-root header cache written by create_xenon_god_files.
+HEADER_CACHE = '.autorxte_fits_cache.json'
+
+def _iter_fits(root: str):
+    """Yield path strings of candidate PCA FITS files under root.
+
+    Walks with os.scandir and tests names on the DirEntry, so files that are
+    not 'F*' or 'F*.gz' never get a Path object.
+    """
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                name = entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif name.startswith('F') and ('.' not in name or name.endswith('.gz')) \
+                        and entry.is_file():
+                    yield entry.path
+
+def read_fits_header_xenon(file_path: Union[str, Path], extension: str = 'XTE_SP'):
+    """Read DATAMODE and DDESC from Xenon FITS file.
+
+    Only the header of `extension` is parsed; the HDU data is never read.
+    astropy opens .gz files itself, so no gzip wrapper is needed.
+
+    Returns ('N/A', 'N/A') when the file has no such extension, and None
+    when it could not be read at all (I/O error, truncated download), so
+    callers can tell a definite answer from a failure worth retrying.
+    """
     try:
-        if file_path.suffix == '.gz':
-            with gzip.open(file_path, 'rb') as gz:
-                with fits.open(gz) as hdul:
-                    if extension in hdul:
-                        hdr = hdul[extension].header
-                        return hdr.get('DATAMODE', 'N/A'), hdr.get('DDESC', 'N/A')
-        else:
-            with fits.open(file_path) as hdul:
-                if extension in hdul:
-                    hdr = hdul[extension].header
-                    return hdr.get('DATAMODE', 'N/A'), hdr.get('DDESC', 'N/A')
+        hdr = fits.getheader(file_path, extname=extension, memmap=True,
+                             lazy_load_hdus=True, ignore_missing_end=True)
+        return hdr.get('DATAMODE', 'N/A'), hdr.get('DDESC', 'N/A')
+    except KeyError:
+        # No such extension in this file.
+        return 'N/A', 'N/A'
     except Exception as e:
-        logger.warning(f"Error reading {file_path.name}: {e}")
-    return 'N/A', 'N/A'
+        logger.warning(f"Error reading {os.path.basename(file_path)}: {e}")
+        return None
+
+def _load_header_cache(cache_file: Path) -> Dict:
+    """Load the header cache written by create_xenon_god_files, or {}."""
+    try:
+        with open(cache_file) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_header_cache(cache_file: Path, cache: Dict):
+    try:
+        with open(cache_file, 'w') as f:
+            json.dump(cache, f)
+    except OSError as e:
+        logger.warning(f"Could not write {cache_file}: {e}")
+
+def _process_obs_dir(entry: Path, extension: str, read_workers: int = 1,
+                     cache: Optional[Dict[str, list]] = None):
+    """Write <entry>/xenon_files.god from the Xenon FITS files under entry/pca.
+
+    `cache` maps a path (relative to entry) to [st_mtime_ns, st_size,
+    DATAMODE, DDESC] from an earlier run; files whose mtime and size are
+    unchanged are not reopened.
+
+    Returns (god_path, files_written, cache); god_path is None when no Xenon
+    files were found, and the returned cache holds an entry for every file
+    seen in this run whose header was read (files that failed to read are
+    left out, so the next run tries them again). Raises FileNotFoundError when entry has no pca/ subdir.
+    Runs in a worker process, so it only touches its own obsid directory.
+    """
+    pca = entry / 'pca'
+    if not pca.is_dir():
+        raise FileNotFoundError(f"No pca/ in {entry.name}")
+    cache = cache or {}
+
+    # Find candidate FITS files; reuse cached headers where the file is
+    # unchanged and read the rest in parallel (header-only reads are I/O bound).
+    prefix_len = len(str(entry)) + 1
+    candidates = list(_iter_fits(str(pca)))
+    new_cache: Dict[str, list] = {}
+    headers = {}
+    misses = []
+    for f in candidates:
+        st = os.stat(f)
+        key = f[prefix_len:]
+        hit = cache.get(key)
+        if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+            headers[f] = (hit[2], hit[3])
+            new_cache[key] = hit
+        else:
+            misses.append((f, key, st))
+    if misses:
+        with ThreadPoolExecutor(max_workers=read_workers) as executor:
+            read = executor.map(
+                lambda m: read_fits_header_xenon(m[0], extension), misses
+            )
+            for (f, key, st), hdr in zip(misses, read):
+                if hdr is None:
+                    # Read failed; leave it out of the list and the cache.
+                    headers[f] = ('N/A', 'N/A')
+                    continue
+                headers[f] = hdr
+                new_cache[key] = [st.st_mtime_ns, st.st_size, *hdr]
+
+    xenon_files = []
+    for f in candidates:
+        dm, dd = headers[f]
+        if dm != 'N/A':
+            # Remove .gz extension for the list. (Not rstrip('.gz'), which
+            # strips any trailing '.', 'g' or 'z' characters.)
+            xenon_files.append(f[:-3] if f.endswith('.gz') else f)
+
+    if not xenon_files:
+        return None, 0, new_cache
+
+    god_file = entry / 'xenon_files.god'
+    god_file.write_text("\n".join(xenon_files) + "\n")
+    return god_file, len(xenon_files), new_cache
 
 def create_xenon_god_files(root_dir: Optional[Path] = None, 
                           extension: Optional[str] = None,
+                          workers: Optional[int] = None,
                           interactive: bool = True):
-    """Create xenon_files.god for all numbered directories."""
+    """Create xenon_files.god for all numbered directories.
+
+    Observation directories are processed in parallel by a process pool
+    (`workers` processes). Each reads its headers with a few threads, sized
+    so that all processes together stay around one thread per core (at most
+    8 each). With workers=1 everything stays in this process.
+
+    Headers read here are cached in <root_dir>/.autorxte_fits_cache.json,
+    keyed on file mtime and size, so a rerun over unchanged pca/ trees only
+    stats the files.
+    """
     if interactive:
         root_dir = get_path("Root directory", Path('.'), root_dir)
         extension = get_input("FITS extension", "XTE_SP", extension)
+        workers = get_int("Parallel workers", multiprocessing.cpu_count(), workers)
     else:
         root_dir = root_dir or Path('.')
         extension = extension or "XTE_SP"
+        workers = workers or multiprocessing.cpu_count()
     
+    entries = [
+        e for e in sorted(root_dir.iterdir())
+        if e.is_dir() and any(c.isdigit() for c in e.name)
+    ]
+
+    # {extension: {obsid dir name: {path relative to obsid dir: [...]}}}
+    cache_file = root_dir / HEADER_CACHE
+    cache = _load_header_cache(cache_file)
+    ext_cache = cache.setdefault(extension, {})
+
+    pool_cls = ThreadPoolExecutor if workers == 1 else ProcessPoolExecutor
+    # Header reads per process. Using `workers` here too would put workers**2
+    # files open at once, which swamps NFS on a many-core node.
+    read_workers = max(1, min(8, (os.cpu_count() or 1) // workers))
     count = 0
-    for entry in root_dir.iterdir():
-        if not entry.is_dir() or not any(c.isdigit() for c in entry.name):
-            continue
-        
-        pca = entry / 'pca'
-        if not pca.is_dir():
-            logger.warning(f"No pca/ in {entry.name}")
-            continue
-        
-        # Find FITS files
-        xenon_files = []
-        for f in pca.rglob('*'):
-            if f.is_file() and ('.' not in f.name or f.name.endswith('.gz')) and f.name.startswith('F'):
-                dm, dd = read_fits_header_xenon(f, extension)
-                if dm != 'N/A':
-                    # Remove .gz extension for the list
-                    file_path = str(f).rstrip('.gz')
-                    xenon_files.append(file_path)
-        
-        if xenon_files:
-            god_file = entry / 'xenon_files.god'
-            with open(god_file, 'w') as gf:
-                for fp in xenon_files:
-                    gf.write(fp + "\n")
-            logger.info(f"✓ Created {god_file} ({len(xenon_files)} files)")
+    with pool_cls(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                _process_obs_dir, e, extension, read_workers, ext_cache.get(e.name),
+            ): e
+            for e in entries
+        }
+        for fut in as_completed(futures):
+            entry = futures[fut]
+            try:
+                god_file, n_files, ext_cache[entry.name] = fut.result()
+            except FileNotFoundError as e:
+                logger.warning(str(e))
+                continue
+            except Exception as e:
+                logger.error(f"FAIL {entry.name}: {type(e).__name__}: {e}")
+                continue
+            if god_file is None:
+                logger.warning(f"No Xenon FITS files in {entry.name}/pca")
+                continue
+            logger.info(f"✓ Created {god_file} ({n_files} files)")
             count += 1
-        else:
-            logger.warning(f"No Xenon FITS files in {entry.name}/pca")
     
+    _save_header_cache(cache_file, cache)
     logger.info(f"Complete: {count} xenon_files.god created")
 
 def move_xenon_god_files(root_dir: Optional[Path] = None,
-                        interactive: bool = True):
-    """Move xenon_files.god to Analysis directories."""
+                        results_dirs: Optional[List[Path]] = None,
+                        interactive: bool = True) -> List[Path]:
+    """Move xenon_files.god to Analysis directories.
+
+    `results_dirs` may be passed in by a caller that already listed the
+    <obsid>-results dirs under root_dir (see xenon_complete_workflow).
+    Returns the results dirs whose Analysis/ now holds xenon_files.god,
+    whether moved by this call or by an earlier run.
+    """
     if interactive:
         root_dir = get_path("Root directory", Path('.'), root_dir)
     else:
         root_dir = root_dir or Path('.')
     
+    if results_dirs is None:
+        results_dirs = find_results_dirs(root_dir)
+
+    # One scandir of root_dir answers "does the obsid dir exist" for every
+    # results dir, instead of an is_dir() stat per iteration.
+    with os.scandir(root_dir) as it:
+        top_dirs = {e.name for e in it if e.is_dir()}
+
     count = 0
-    for results_dir in root_dir.glob('*-results'):
-        if not results_dir.is_dir():
-            continue
-        
+    ready = []
+    for results_dir in results_dirs:
         parent_name = results_dir.name[:-len('-results')]
         parent_dir = root_dir / parent_name
         analysis_dir = results_dir / 'Analysis'
-        analysis_dir.mkdir(parents=True, exist_ok=True)
+        dst = analysis_dir / 'xenon_files.god'
         
-        if parent_dir.is_dir():
+        if parent_name in top_dirs:
             src = parent_dir / 'xenon_files.god'
             if src.exists():
-                dst = analysis_dir / 'xenon_files.god'
-                shutil.move(str(src), str(dst))
+                # Analysis/ is only needed when there is something to move.
+                analysis_dir.mkdir(parents=True, exist_ok=True)
+                try:
+                    # Same filesystem: a single atomic rename, overwriting dst.
+                    os.replace(src, dst)
+                except OSError:
+                    shutil.move(str(src), str(dst))
                 logger.info(f"✓ Moved to {results_dir.name}/Analysis")
                 count += 1
-            else:
-                logger.warning(f"No xenon_files.god in {parent_dir}")
+                ready.append(results_dir)
+                continue
+            logger.warning(f"No xenon_files.god in {parent_dir}")
+        if dst.exists():
+            ready.append(results_dir)
     
     logger.info(f"Complete: {count} files moved")
+    return ready
+
+def _make_se_single(analysis_dir: Path, output_root: str, timeout: int = 1800) -> str:
+    """Run make_se in one Analysis/ dir under a pty. Returns the results dir name."""
+    # Run via pty so make_se sees a real terminal.
+    run_heasoft_pty(
+        ['make_se'],
+        input_text=f"xenon_files.god\n{output_root}\n",
+        cwd=analysis_dir,
+        timeout=timeout,
+    )
+    return analysis_dir.parent.name
 
 def run_make_se(root_dir: Optional[Path] = None,
                output_root: Optional[str] = None,
+               results_dirs: Optional[List[Path]] = None,
+               workers: Optional[int] = None,
                interactive: bool = True):
     """Run make_se to generate Xenon event files.
     
-    Note: This creates separate processes for each observation.
-    In interactive mode, this will open new terminals (Linux only).
+    Note: This creates separate processes for each observation, up to
+    `workers` at a time. In interactive mode, this can instead open new
+    terminals (Linux only).
     """
     require_heasoft_tool('make_se')
     
@@ -124,57 +289,73 @@ def run_make_se(root_dir: Optional[Path] = None,
         root_dir = get_path("Root directory", Path('.'), root_dir)
         output_root = get_input("Output root name", "event", output_root)
         use_terminals = get_yes_no("Open new terminals? (Linux only)", False)
+        if not use_terminals:
+            workers = get_int("Parallel workers", multiprocessing.cpu_count(), workers)
     else:
         root_dir = root_dir or Path('.')
         output_root = output_root or "event"
         use_terminals = False
+        workers = workers or multiprocessing.cpu_count()
     
-    count = 0
-    for results_dir in root_dir.glob('*-results'):
-        if not results_dir.is_dir():
-            continue
-        
+    if results_dirs is None:
+        results_dirs = find_results_dirs(root_dir)
+
+    analysis_dirs = []
+    for results_dir in results_dirs:
         analysis_dir = results_dir / 'Analysis'
         god_file = analysis_dir / 'xenon_files.god'
         
         if not god_file.exists():
             logger.warning(f"No xenon_files.god in {results_dir.name}/Analysis")
             continue
-        
-        script_text = f"xenon_files.god\n{output_root}\n"
+        analysis_dirs.append(analysis_dir)
 
-        try:
-            if use_terminals:
+    count = 0
+    if use_terminals:
+        script_text = f"xenon_files.god\n{output_root}\n"
+        for analysis_dir in analysis_dirs:
+            results_name = analysis_dir.parent.name
+            try:
                 # Open in new terminal (Linux only); for interactive debugging.
-                tmp = analysis_dir / 'make_se_script.txt'
-                tmp.write_text(script_text)
-                bash_cmd = f"cd '{analysis_dir}' && make_se < make_se_script.txt; exec bash"
+                # The answers are piped in by printf, so no script file is
+                # written into Analysis/.
+                answers = ' '.join(shlex.quote(a) for a in script_text.splitlines())
+                bash_cmd = (
+                    f"cd {shlex.quote(str(analysis_dir))} && "
+                    f"printf '%s\\n' {answers} | make_se; exec bash"
+                )
                 subprocess.Popen(['gnome-terminal', '--', 'bash', '-c', bash_cmd])
-                logger.info(f"OK   launched make_se in terminal for {results_dir.name}")
-            else:
-                # Run via pty so make_se sees a real terminal.
-                try:
-                    run_heasoft_pty(
-                        ['make_se'],
-                        input_text=script_text,
-                        cwd=analysis_dir,
-                        timeout=1800,
-                    )
-                    logger.info(f"OK   {results_dir.name}")
-                except HEASoftToolError as e:
-                    logger.error(f"FAIL {results_dir.name}: {e}")
-                    continue
-            count += 1
-        except Exception as e:
-            logger.error(f"FAIL {results_dir.name}: {type(e).__name__}: {e}")
-    
-    if use_terminals:
+                logger.info(f"OK   launched make_se in terminal for {results_name}")
+                count += 1
+            except Exception as e:
+                logger.error(f"FAIL {results_name}: {type(e).__name__}: {e}")
         logger.info(f"Launched {count} make_se processes in terminals")
-    else:
-        logger.info(f"Complete: {count} observations processed")
+        return
+
+    if not analysis_dirs:
+        logger.warning("No work to do.")
+        return
+
+    logger.info(f"Running make_se on {len(analysis_dirs)} observations with {workers} workers")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_make_se_single, d, output_root): d for d in analysis_dirs
+        }
+        for fut in as_completed(futures):
+            results_name = futures[fut].parent.name
+            try:
+                logger.info(f"OK   {fut.result()}")
+                count += 1
+            except HEASoftToolError as e:
+                logger.error(f"FAIL {results_name}: {e}")
+            except Exception as e:
+                logger.error(f"FAIL {results_name}: {type(e).__name__}: {e}")
+    
+    logger.info(f"Complete: {count} observations processed")
 
 def create_xenon_event_lists(root_dir: Optional[Path] = None,
                             pattern: Optional[str] = None,
+                            results_dirs: Optional[List[Path]] = None,
                             interactive: bool = True):
     """Create xenon_event_files.txt listing generated Xenon event files."""
     if interactive:
@@ -184,11 +365,11 @@ def create_xenon_event_lists(root_dir: Optional[Path] = None,
         root_dir = root_dir or Path('.')
         pattern = pattern or "xenon_event_gx*"
     
+    if results_dirs is None:
+        results_dirs = find_results_dirs(root_dir)
+
     count = 0
-    for results_dir in root_dir.glob('*-results'):
-        if not results_dir.is_dir():
-            continue
-        
+    for results_dir in results_dirs:
         analysis_dir = results_dir / 'Analysis'
         if not analysis_dir.is_dir():
             continue
@@ -197,9 +378,7 @@ def create_xenon_event_lists(root_dir: Optional[Path] = None,
         
         if event_files:
             list_file = analysis_dir / 'xenon_event_files.txt'
-            with open(list_file, 'w') as f:
-                for ef in event_files:
-                    f.write(str(ef) + "\n")
+            list_file.write_text("\n".join(str(ef) for ef in event_files) + "\n")
             logger.info(f"✓ {results_dir.name}: {len(event_files)} files")
             count += 1
         else:
@@ -213,13 +392,23 @@ def xenon_complete_workflow(root_dir: Optional[Path] = None,
     """Run complete Xenon mode workflow."""
     logger.info("Starting complete Xenon mode workflow")
     
+    # Resolve the root once so each step does not prompt for it again.
+    if interactive:
+        root_dir = get_path("Root directory", Path('.'), root_dir)
+    else:
+        root_dir = root_dir or Path('.')
+
     # Step 1: Create xenon_files.god
     logger.info("Step 1: Creating xenon_files.god")
     create_xenon_god_files(root_dir, interactive=interactive)
     
-    # Step 2: Move to Analysis directories
+    # Step 2: Move to Analysis directories. The move step walks the
+    # <obsid>-results dirs once and hands back those that ended up with a
+    # xenon_files.god; only they can produce events, so the later steps
+    # reuse that list instead of walking root_dir again.
     logger.info("Step 2: Moving xenon_files.god to Analysis")
-    move_xenon_god_files(root_dir, interactive=interactive)
+    results_dirs = move_xenon_god_files(root_dir, results_dirs=find_results_dirs(root_dir),
+                                        interactive=interactive)
     
     # Step 3: Run make_se (optional)
     if interactive:
@@ -227,11 +416,12 @@ def xenon_complete_workflow(root_dir: Optional[Path] = None,
     
     if run_make_se_flag if run_make_se_flag is not None else True:
         logger.info("Step 3: Running make_se")
-        run_make_se(root_dir, interactive=interactive)
+        run_make_se(root_dir, results_dirs=results_dirs, interactive=interactive)
         
         # Step 4: Create event file lists
         logger.info("Step 4: Creating xenon_event_files.txt")
-        create_xenon_event_lists(root_dir, interactive=interactive)
+        create_xenon_event_lists(root_dir, results_dirs=results_dirs,
+                                 interactive=interactive)
     else:
         logger.info("Skipping make_se - run manually if needed")
     
@@ -248,6 +438,7 @@ if __name__ == '__main__':
     god_parser = subparsers.add_parser('create-god', help='Create xenon_files.god')
     god_parser.add_argument('--directory', type=Path)
     god_parser.add_argument('--extension', default='XTE_SP')
+    god_parser.add_argument('--workers', type=int)
     
     # Move god files
     move_parser = subparsers.add_parser('move-god', help='Move xenon_files.god')
@@ -257,6 +448,7 @@ if __name__ == '__main__':
     make_se_parser = subparsers.add_parser('make-se', help='Run make_se')
     make_se_parser.add_argument('--directory', type=Path)
     make_se_parser.add_argument('--output-root', default='event')
+    make_se_parser.add_argument('--workers', type=int)
     
     # Create event lists
     list_parser = subparsers.add_parser('list-events', help='Create event file lists')
@@ -271,12 +463,12 @@ if __name__ == '__main__':
     args = parser.parse_args()
     
     if args.command == 'create-god':
-        create_xenon_god_files(args.directory, args.extension, 
+        create_xenon_god_files(args.directory, args.extension, args.workers,
                               interactive=args.directory is None)
     elif args.command == 'move-god':
         move_xenon_god_files(args.directory, interactive=args.directory is None)
     elif args.command == 'make-se':
-        run_make_se(args.directory, args.output_root, 
+        run_make_se(args.directory, args.output_root, workers=args.workers,
                    interactive=args.directory is None)
     elif args.command == 'list-events':
         create_xenon_event_lists(args.directory, args.pattern,
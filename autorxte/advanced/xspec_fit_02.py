@@ -12,34 +12,30 @@ and refit_revision/astrosat/same_folder_xcm_runner.txt.
 """
 import csv
 import logging
+import multiprocessing
+import os
 import re
 import shutil
 from pathlib import Path
 from typing import Optional, Dict, List, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from autorxte.utils import require_heasoft_tool, run_heasoft_pty, HEASoftToolError
+from autorxte.utils import (
+    require_heasoft_tool, run_heasoft_pty, HEASoftToolError, find_results_dirs,
+)
 from autorxte.utils.interactive import (
     get_path, get_input, get_float, get_yes_no, get_int,
 )
 
 logger = logging.getLogger(__name__)
 
-OBSID_RE = re.compile(r'^\d{5}-\d{2}-\d{2}-\d{2}[A-Z]?$')
-
 # XSPEC commands we may rewrite the path argument of. Format:
 #   data [grp:][num] <path>
 #   response [grp:][num] <path>
 #   backgrnd [num] <path>
 #   arf [grp:][num] <path>
 #   corfile [grp:][num] <path>
-PATH_CMDS = ('data', 'response', 'arf', 'backgrnd', 'back', 'corfile')
-
-
-def _is_results_dir_for_obsid(entry: Path) -> bool:
-    if not entry.is_dir() or not entry.name.endswith('-results'):
-        return False
-    return bool(OBSID_RE.match(entry.name[:-len('-results')]))
+PATH_CMDS = frozenset(('data', 'response', 'arf', 'backgrnd', 'back', 'corfile'))
 
 
 def rewrite_xcm_paths(template_text: str, target_dir: Path) -> str:
@@ -53,6 +49,8 @@ def rewrite_xcm_paths(template_text: str, target_dir: Path) -> str:
     Other lines (model, ignore, fit settings, parameter values) are left
     untouched.
     """
+    # Join with plain strings; a Path per rewritten line is not needed.
+    prefix = os.path.join(os.fspath(target_dir), '')
     out_lines = []
     for line in template_text.splitlines():
         stripped = line.strip()
@@ -69,7 +67,7 @@ def rewrite_xcm_paths(template_text: str, target_dir: Path) -> str:
         # Last token is the path. (Earlier tokens are the command and
         # optional group/index specifiers like "1:1" or "1".)
         old_path = tokens[-1]
-        new_path = str(target_dir / Path(old_path).name)
+        new_path = prefix + os.path.basename(old_path)
         new_tokens = tokens[:-1] + [new_path]
         # Preserve leading whitespace if any.
         leading = line[: len(line) - len(line.lstrip())]
@@ -77,6 +75,24 @@ def rewrite_xcm_paths(template_text: str, target_dir: Path) -> str:
     return '\n'.join(out_lines) + ('\n' if template_text.endswith('\n') else '')
 
 
+def _template_inputs(template_text: str) -> List[str]:
+    """Basenames of the files the template's PATH_CMDS lines load, i.e. the
+    files rewrite_xcm_paths expects to find in each Analysis/.
+
+    `none` arguments (e.g. `response 1 none`) and XSPEC's `{n}` spectrum
+    selectors are skipped/stripped.
+    """
+    names: List[str] = []
+    for line in template_text.splitlines():
+        tokens = line.split()
+        if len(tokens) < 2 or tokens[0].lower() not in PATH_CMDS:
+            continue
+        base = os.path.basename(tokens[-1]).split('{', 1)[0]
+        if base and base.lower() != 'none' and base not in names:
+            names.append(base)
+    return names
+
+
 def _parse_int_list(spec: Optional[str]) -> List[int]:
     """Parse a comma-separated int spec ('1,2,3') or range ('1-6') or mix
     ('1,3-5,7') into a list of ints. None returns []."""
@@ -115,16 +131,12 @@ def _build_xspec_script(
     if energy_range is not None:
         emin, emax = energy_range
         lines += [f"ignore **-{emin}", f"ignore {emax}-**"]
-    for p in freeze:
-        lines.append(f"freeze {p}")
-    for p in thaw:
-        lines.append(f"thaw {p}")
-    for g in gain_groups:
-        # Plain `gain fit N` (without `:1`) avoids a re-prompt under non-tty.
-        lines.append(f"gain fit {g}")
+    lines.extend(f"freeze {p}" for p in freeze)
+    lines.extend(f"thaw {p}" for p in thaw)
+    # Plain `gain fit N` (without `:1`) avoids a re-prompt under non-tty.
+    lines.extend(f"gain fit {g}" for g in gain_groups)
     lines.append(f"fit {fit_iter}")
-    for p in error_params:
-        lines.append(f"error {p}")
+    lines.extend(f"error {p}" for p in error_params)
     if flux_range is not None:
         emin, emax = flux_range
         lines.append(f"flux {emin} {emax}")
@@ -165,6 +177,33 @@ _RE_FLUX = re.compile(
 )
 
 
+def _last_match(regex: 're.Pattern', text: str,
+                literal: str) -> Optional['re.Match']:
+    """Last match of `regex` in `text` (xspec reprints stats after each
+    fit/error step; only the final one is wanted), or None.
+
+    `literal` is a fixed string every match contains. The regex is first
+    run only from the start of the line holding its last occurrence, so a
+    long log is not scanned end to end; a full scan is the fallback if no
+    match there starts at or before that occurrence.
+    """
+    idx = text.rfind(literal)
+    if idx < 0:
+        return None
+    last = None
+    for m in regex.finditer(text, text.rfind('\n', 0, idx) + 1):
+        if m.start() > idx:
+            # Can't contain `literal`; nothing later can either.
+            break
+        last = m
+    if last is not None:
+        return last
+    m = None
+    for m in regex.finditer(text):
+        pass
+    return m
+
+
 def parse_xspec_log(log_text: str, obsid: str, error_params: List[int],
                     flux_range: Optional[Tuple[float, float]]) -> Dict:
     """Pull chi^2/dof, per-parameter values, error confidence bounds, and
@@ -172,12 +211,12 @@ def parse_xspec_log(log_text: str, obsid: str, error_params: List[int],
     results: Dict[str, str] = {'obsid': obsid, 'chi2': 'N/A',
                                 'dof': 'N/A', 'reduced_chi2': 'N/A'}
 
-    chi2_hits = list(_RE_CHI2.finditer(log_text))
-    dof_hits = list(_RE_DOF.finditer(log_text))
-    if chi2_hits:
-        results['chi2'] = chi2_hits[-1].group(1)
-    if dof_hits:
-        results['dof'] = dof_hits[-1].group(1)
+    chi2_hit = _last_match(_RE_CHI2, log_text, 'Chi-Squared')
+    dof_hit = _last_match(_RE_DOF, log_text, 'degrees of freedom')
+    if chi2_hit:
+        results['chi2'] = chi2_hit.group(1)
+    if dof_hit:
+        results['dof'] = dof_hit.group(1)
     try:
         if results['chi2'] != 'N/A' and results['dof'] != 'N/A':
             results['reduced_chi2'] = (
@@ -187,7 +226,7 @@ def parse_xspec_log(log_text: str, obsid: str, error_params: List[int],
         pass
 
     # Per-parameter best-fit values from the post-fit summary table.
-    for m in _RE_PARAM.finditer(log_text):
+    for m in (_RE_PARAM.finditer(log_text) if '+/-' in log_text else ()):
         par_num, _grp, comp, parm, value, _err = m.groups()
         key = f"p{par_num}_{comp}_{parm}"
         results[key] = value
@@ -206,9 +245,9 @@ def parse_xspec_log(log_text: str, obsid: str, error_params: List[int],
 
     # `flux` result: the integrated photon flux + erg flux for the band.
     if flux_range is not None:
-        flux_hits = list(_RE_FLUX.finditer(log_text))
-        if flux_hits:
-            ph, erg = flux_hits[-1].groups()
+        flux_hit = _last_match(_RE_FLUX, log_text, 'Flux')
+        if flux_hit:
+            ph, erg = flux_hit.groups()
             emin, emax = flux_range
             tag = f"flux_{emin}_{emax}"
             results[f"{tag}_photons"] = ph
@@ -275,6 +314,95 @@ def apply_xcm_to_one(
     return parse_xspec_log(output, obsid, error_params, flux_range)
 
 
+# Printed by Tcl `puts` between targets of a batched session. The pty echo of
+# the `puts "..."` command itself does not match because of the quotes.
+_BATCH_MARK = 'AUTORXTE-TARGET'
+_RE_BATCH_MARK = re.compile(rf'^{_BATCH_MARK} (\S+)\s*$', re.MULTILINE)
+
+
+def apply_xcm_batch(
+    results_dirs: List[Path],
+    template_text: str,
+    energy_range: Optional[Tuple[float, float]],
+    freeze: List[int],
+    thaw: List[int],
+    fit_iter: int,
+    error_params: List[int],
+    flux_range: Optional[Tuple[float, float]],
+    gain_groups: List[int],
+    name: str,
+    rewrite_paths: bool,
+    timeout: int,
+) -> List[Dict]:
+    """Like apply_xcm_to_one, but fit every target in `results_dirs` from a
+    single xspec session, so xspec starts (and loads its model tables) once
+    rather than once per obsid.
+
+    The session `cd`s into each Analysis/ in turn and prints a marker line
+    before each target; the captured output is split on those markers into
+    the per-target <name>.log files and parsed as usual. Returns one result
+    dict per target; targets whose <name>_bestfit.xcm did not appear get an
+    'error' entry instead of failing the whole batch.
+    """
+    session: List[str] = []
+    targets: List[Tuple[str, Path]] = []
+    for results_dir in results_dirs:
+        obsid = results_dir.name[:-len('-results')]
+        analysis = (results_dir / "Analysis").resolve()
+        target_xcm = analysis / f"{name}.xcm"
+        if rewrite_paths:
+            target_xcm.write_text(rewrite_xcm_paths(template_text, analysis))
+        else:
+            target_xcm.write_text(template_text)
+
+        script = _build_xspec_script(
+            xcm_filename=target_xcm.name,
+            energy_range=energy_range,
+            freeze=freeze, thaw=thaw,
+            fit_iter=fit_iter,
+            error_params=error_params,
+            flux_range=flux_range,
+            gain_groups=gain_groups,
+            save_basename=name,
+        )
+        # Drop the trailing `exit`; clear the previous target's data and
+        # model before loading the next one.
+        session += [f'cd "{analysis}"', f'puts "{_BATCH_MARK} {obsid}"']
+        session += script.splitlines()[:-1]
+        session += ["data none", "model clear"]
+        targets.append((obsid, analysis))
+    session.append("exit")
+
+    # The session can be far larger than the pty input buffer, so hand it to
+    # xspec as a script file instead of typing it in.
+    session_file = results_dirs[0].parent.resolve() / f"{name}_session_{targets[0][0]}.xcm"
+    session_file.write_text("\n".join(session) + "\n")
+    try:
+        _rc, output = run_heasoft_pty(
+            ['xspec'], input_text=f"@{session_file}\nexit\n",
+            cwd=targets[0][1], timeout=timeout * len(targets),
+        )
+    finally:
+        session_file.unlink()
+
+    # Split the combined output into per-target sections.
+    sections: Dict[str, str] = {}
+    marks = list(_RE_BATCH_MARK.finditer(output))
+    for m, nxt in zip(marks, marks[1:] + [None]):
+        sections[m.group(1)] = output[m.end():nxt.start() if nxt else len(output)]
+
+    rows: List[Dict] = []
+    for obsid, analysis in targets:
+        text = sections.get(obsid, '')
+        (analysis / f"{name}.log").write_text(text)
+        if not (analysis / f"{name}_bestfit.xcm").exists():
+            rows.append({'obsid': obsid,
+                          'error': f"xspec did not write {name}_bestfit.xcm"})
+            continue
+        rows.append(parse_xspec_log(text, obsid, error_params, flux_range))
+    return rows
+
+
 def apply_xcm_template(
     template: Optional[Path] = None,
     root_dir: Optional[Path] = None,
@@ -291,6 +419,7 @@ def apply_xcm_template(
     skip_existing: Optional[bool] = None,
     timeout: int = 1800,
     output_csv: Optional[Path] = None,
+    batch: Optional[bool] = None,
     interactive: bool = True,
 ):
     """Distribute `template` across every <obsid>-results/Analysis/ under
@@ -311,9 +440,13 @@ def apply_xcm_template(
             `backgrnd`/`arf`/`corfile` paths so each instance points at
             its own Analysis/ files (basename preserved). If False, copy
             the template verbatim (assumes it works in cwd=Analysis/).
-        workers: parallel xspec workers
+        workers: parallel xspec workers (default: CPU count). Each target
+            is an independent xspec process, so fits scale with cores.
         skip_existing: skip when <name>_bestfit.xcm already present
         output_csv: where to write the aggregated results
+        batch: if True, each worker fits its share of the targets in one
+            xspec session (see apply_xcm_batch) instead of starting xspec
+            per obsid. Worth it for short fits, where startup dominates.
         interactive: prompt for missing args
     """
     require_heasoft_tool('xspec')
@@ -349,7 +482,8 @@ def apply_xcm_template(
             "Rewrite data/response/backgrnd paths to each Analysis/?",
             True, rewrite_paths,
         )
-        workers = get_int("Parallel xspec workers", 1, workers)
+        workers = get_int("Parallel xspec workers",
+                          multiprocessing.cpu_count(), workers)
         skip_existing = get_yes_no(
             "Skip targets where <name>_bestfit.xcm already exists?",
             True, skip_existing,
@@ -357,6 +491,9 @@ def apply_xcm_template(
         output_csv = get_path(
             "Output CSV path", Path("xspec_batch.csv"), output_csv,
         )
+        batch = get_yes_no(
+            "Fit each worker's targets in one xspec session?", False, batch,
+        )
     else:
         if template is None:
             raise ValueError("apply_xcm_template needs `template` "
@@ -365,8 +502,9 @@ def apply_xcm_template(
         name = name or template.stem
         skip_existing = skip_existing if skip_existing is not None else True
         rewrite_paths = rewrite_paths if rewrite_paths is not None else True
-        workers = workers if workers is not None else 1
+        workers = workers or multiprocessing.cpu_count()
         output_csv = output_csv or Path("xspec_batch.csv")
+        batch = bool(batch)
 
     template = Path(template)
     if not template.is_file():
@@ -381,18 +519,26 @@ def apply_xcm_template(
     freeze = _parse_int_list(freeze_spec)
     thaw = _parse_int_list(thaw_spec)
 
-    # Plan tasks.
+    # Plan tasks. One scandir per Analysis/ answers every pre-flight question
+    # (dir present, template inputs present, bestfit already written), so
+    # targets that would fail are dropped before any xspec is started.
+    inputs = _template_inputs(template_text) if rewrite_paths else []
     tasks: List[Path] = []
-    for results_dir in sorted(root_dir.iterdir()):
-        if not _is_results_dir_for_obsid(results_dir):
-            continue
-        analysis = results_dir / "Analysis"
-        if not analysis.is_dir():
+    for results_dir in find_results_dirs(root_dir):
+        obsid = results_dir.name[:-len('-results')]
+        try:
+            with os.scandir(results_dir / "Analysis") as it:
+                present = {e.name: e for e in it}
+        except (FileNotFoundError, NotADirectoryError):
             logger.warning(f"{results_dir.name}: no Analysis/; skip")
             continue
-        save_xcm = analysis / f"{name}_bestfit.xcm"
-        if skip_existing and save_xcm.exists() and save_xcm.stat().st_size > 0:
-            logger.info(f"SKIP {results_dir.name[:-len('-results')]} "
+        missing = [n for n in inputs if n not in present]
+        if missing:
+            logger.warning(f"{obsid}: missing {', '.join(missing)} in Analysis/; skip")
+            continue
+        save_xcm = present.get(f"{name}_bestfit.xcm")
+        if skip_existing and save_xcm is not None and save_xcm.stat().st_size > 0:
+            logger.info(f"SKIP {obsid} "
                          f"({name}_bestfit.xcm already exists)")
             continue
         tasks.append(results_dir)
@@ -418,47 +564,76 @@ def apply_xcm_template(
 
     rows: List[Dict] = []
     failures = 0
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        futures = {
-            executor.submit(
-                apply_xcm_to_one,
-                d, template_text, energy_range, freeze, thaw,
-                fit_iter, error_params, flux_range, gain_groups,
-                name, rewrite_paths, timeout,
-            ): d for d in tasks
-        }
-        for fut in as_completed(futures):
-            d = futures[fut]
-            try:
-                row = fut.result()
-                rows.append(row)
-                logger.info(
-                    f"OK   {row['obsid']}  chi2={row['chi2']}/{row['dof']}"
-                    f" = {row['reduced_chi2']}"
-                )
-            except (HEASoftToolError, FileNotFoundError) as e:
-                failures += 1
-                rows.append({'obsid': d.name, 'error': str(e)[:200]})
-            except Exception as e:
-                failures += 1
-                logger.error(
-                    f"FAIL {d.name}: {type(e).__name__}: {e}"
-                )
-                rows.append({'obsid': d.name,
-                              'error': f"{type(e).__name__}: {e}"})
-
-    # Union of all keys across rows so the CSV header has every column we saw.
-    all_keys: List[str] = []
-    seen = set()
-    for r in rows:
-        for k in r:
-            if k not in seen:
-                seen.add(k)
-                all_keys.append(k)
-    with open(output_csv, 'w', newline='') as f:
-        w = csv.DictWriter(f, fieldnames=all_keys)
-        w.writeheader()
-        w.writerows(rows)
+    if batch:
+        # One session per worker, targets dealt round-robin.
+        chunks = [tasks[i::workers] for i in range(min(workers, len(tasks)))]
+        with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+            futures = {
+                executor.submit(
+                    apply_xcm_batch,
+                    chunk, template_text, energy_range, freeze, thaw,
+                    fit_iter, error_params, flux_range, gain_groups,
+                    name, rewrite_paths, timeout,
+                ): chunk for chunk in chunks
+            }
+            for fut in as_completed(futures):
+                chunk = futures[fut]
+                try:
+                    chunk_rows = fut.result()
+                except Exception as e:
+                    # The whole session died; every target in it failed.
+                    logger.error(f"FAIL session of {len(chunk)}: "
+                                 f"{type(e).__name__}: {str(e)[:200]}")
+                    chunk_rows = [{'obsid': d.name, 'error': str(e)[:200]}
+                                  for d in chunk]
+                for row in chunk_rows:
+                    rows.append(row)
+                    if 'error' in row:
+                        failures += 1
+                        logger.error(f"FAIL {row['obsid']}: {row['error']}")
+                    else:
+                        logger.info(
+                            f"OK   {row['obsid']}  chi2={row['chi2']}/{row['dof']}"
+                            f" = {row['reduced_chi2']}"
+                        )
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    apply_xcm_to_one,
+                    d, template_text, energy_range, freeze, thaw,
+                    fit_iter, error_params, flux_range, gain_groups,
+                    name, rewrite_paths, timeout,
+                ): d for d in tasks
+            }
+            for fut in as_completed(futures):
+                d = futures[fut]
+                try:
+                    row = fut.result()
+                    rows.append(row)
+                    logger.info(
+                        f"OK   {row['obsid']}  chi2={row['chi2']}/{row['dof']}"
+                        f" = {row['reduced_chi2']}"
+                    )
+                except (HEASoftToolError, FileNotFoundError) as e:
+                    failures += 1
+                    rows.append({'obsid': d.name, 'error': str(e)[:200]})
+                except Exception as e:
+                    failures += 1
+                    logger.error(
+                        f"FAIL {d.name}: {type(e).__name__}: {e}"
+                    )
+                    rows.append({'obsid': d.name,
+                                  'error': f"{type(e).__name__}: {e}"})
+
+    # Union of all keys across rows so the CSV header has every column we saw
+    # (first-seen order, so obsid stays first). Rows go out as plain lists,
+    # which the csv C writer handles without DictWriter's per-row mapping.
+    all_keys = list(dict.fromkeys(k for r in rows for k in r))
+    with open(output_csv, 'w', newline='', buffering=1 << 20) as f:
+        w = csv.writer(f)
+        w.writerow(all_keys)
+        w.writerows([r.get(k, '') for k in all_keys] for r in rows)
     logger.info(f"Results -> {output_csv}")
 
     if failures:
@@ -496,11 +671,14 @@ if __name__ == '__main__':
     parser.add_argument('--thaw', help='Param indices to `thaw` before fit')
     parser.add_argument('--no-rewrite', action='store_true',
                         help='Use the template verbatim instead of rewriting paths.')
-    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--workers', type=int,
+                        help='Parallel xspec workers (default: CPU count)')
     parser.add_argument('--no-skip-existing', action='store_true')
     parser.add_argument('--timeout', type=int, default=1800)
     parser.add_argument('--output', dest='output_csv', type=Path,
                         default=Path('xspec_batch.csv'))
+    parser.add_argument('--batch', action='store_true',
+                        help='Fit each worker\'s targets in one xspec session')
     parser.add_argument('--no-interactive', action='store_true')
     args = parser.parse_args()
 
@@ -526,5 +704,6 @@ if __name__ == '__main__':
         skip_existing=False if args.no_skip_existing else None,
         timeout=args.timeout,
         output_csv=args.output_csv,
+        batch=args.batch or None,
         interactive=not args.no_interactive,
     )
@@ -58,6 +58,8 @@ For detailed help: autorxte <command> --help
     download.add_argument('--auto-detect-region', action='store_true',
                          help='Auto-detect fastest region')
     download.add_argument('--overwrite', action='store_true', help='Re-download existing files')
+    download.add_argument('--refresh-cache', action='store_true',
+                         help='Re-query SIMBAD/HEASARC instead of using cached results')
     download.add_argument('--no-interactive', action='store_true',
                          help='Disable interactive prompts (requires --source)')
     
@@ -108,7 +110,7 @@ For detailed help: autorxte <command> --help
     extract.add_argument('--bitmask', help='Bitmask filename in Analysis/ (default: bitmask_event)')
     extract.add_argument('--split-gti', action='store_true',
                          help='Split multi-row GTI into per-row files and extract each')
-    extract.add_argument('--workers', type=int, help='Parallel seextrct workers')
+    extract.add_argument('--workers', type=int, help='Parallel seextrct workers (default: usable CPUs, at most 16)')
     extract.add_argument('--no-skip-existing', action='store_true',
                          help='Re-extract even when <prefix>.lc already exists')
     extract.add_argument('--no-interactive', action='store_true')
@@ -171,6 +173,8 @@ For detailed help: autorxte <command> --help
     color_plot.add_argument('--bin-size', help='Bin size (-1 = auto)')
     color_plot.add_argument('--plot-device', help='PGPLOT device (default /null)')
     color_plot.add_argument('--workers', type=int)
+    color_plot.add_argument('--no-skip-existing', action='store_true',
+                            help='Re-plot even when the plot file is newer than its lightcurves')
     color_plot.add_argument('--no-interactive', action='store_true')
     
     xspec = subparsers.add_parser('xspec',
@@ -196,11 +200,13 @@ For detailed help: autorxte <command> --help
                        help='Param indices to `thaw` before fit')
     xspec.add_argument('--no-rewrite', action='store_true',
                        help='Use the template verbatim (do not rewrite data/response/backgrnd paths)')
-    xspec.add_argument('--workers', type=int, help='Parallel xspec workers (default 1)')
+    xspec.add_argument('--workers', type=int, help='Parallel xspec workers (default: CPU count)')
     xspec.add_argument('--no-skip-existing', action='store_true')
     xspec.add_argument('--timeout', type=int, default=1800)
     xspec.add_argument('--output', dest='output_csv', type=Path,
                        help='Output CSV (default xspec_batch.csv in cwd)')
+    xspec.add_argument('--batch', action='store_true',
+                       help="Fit each worker's targets in one xspec session")
     xspec.add_argument('--no-interactive', action='store_true')
     
     xenon = subparsers.add_parser('xenon', help='Xenon workflow')
@@ -234,13 +240,10 @@ For detailed help: autorxte <command> --help
         from autorxte.config import load_config
         load_config(args.config)
 
-    # Execute commands
-    from autorxte.core import (
-        search_and_download, prepare_all_obsids, extract_all_events,
-        generate_lightcurves, extract_spectra, compute_pds
-    )
-
+    # Execute commands. Each branch imports only its own step, so e.g.
+    # `autorxte xspec` never loads boto3/astroquery for the download step.
     if args.command == 'download':
+        from autorxte.core import search_and_download
         # Region: explicit --region wins; --auto-detect-region runs the speed test
         # and persists the result; otherwise leave None for the function to handle
         # (interactive prompt or saved preference).
@@ -279,9 +282,11 @@ For detailed help: autorxte <command> --help
             overwrite=overwrite,
             bucket=args.bucket,
             region=region,
+            refresh=args.refresh_cache,
             interactive=interactive,
         )
     elif args.command == 'prepare':
+        from autorxte.core import prepare_all_obsids
         if args.no_interactive:
             interactive = False
         else:
@@ -342,6 +347,7 @@ For detailed help: autorxte <command> --help
             interactive=interactive,
         )
     elif args.command == 'extract':
+        from autorxte.core import extract_all_events
         if args.no_interactive:
             interactive = False
         else:
@@ -359,6 +365,7 @@ For detailed help: autorxte <command> --help
             interactive=interactive,
         )
     elif args.command == 'lightcurves':
+        from autorxte.core import generate_lightcurves
         if args.no_interactive:
             interactive = False
         else:
@@ -379,6 +386,7 @@ For detailed help: autorxte <command> --help
             pculist=args.pculist,
         )
     elif args.command == 'spectra':
+        from autorxte.core import extract_spectra
         if args.no_interactive:
             interactive = False
         else:
@@ -396,6 +404,7 @@ For detailed help: autorxte <command> --help
             interactive=interactive,
         )
     elif args.command == 'pds':
+        from autorxte.core import compute_pds
         if args.no_interactive:
             interactive = False
         else:
@@ -431,11 +440,12 @@ For detailed help: autorxte <command> --help
             interactive = False
         else:
             interactive = args.directory is None
+        skip_existing = False if args.no_skip_existing else None
         plot_color_diagrams(
             args.directory,
             color_names=args.colors, bin_size=args.bin_size,
             plot_device=args.plot_device, workers=args.workers,
-            interactive=interactive,
+            skip_existing=skip_existing, interactive=interactive,
         )
     elif args.command == 'xspec':
         from autorxte.advanced.xspec_fit_02 import apply_xcm_template
@@ -470,6 +480,7 @@ For detailed help: autorxte <command> --help
             skip_existing=skip_existing,
             timeout=args.timeout,
             output_csv=args.output_csv,
+            batch=args.batch or None,
             interactive=interactive,
         )
     elif args.command == 'xenon':
@@ -5,8 +5,20 @@ Users can override defaults by placing a config file in their working directory.
 """
 import yaml
 import multiprocessing
+import threading
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+# libyaml's C loader is several times faster than the pure-Python one; not
+# every PyYAML build ships it.
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Parsed config files keyed by (resolved path, st_mtime_ns), so re-loading an
+# unchanged file (e.g. load_config after the first get_config) skips parsing.
+_PARSE_CACHE: Dict[Tuple[Path, int], Dict] = {}
+
+# Serializes loading and first-time construction; reads take no lock.
+_LOAD_LOCK = threading.RLock()
 
 # Default config file locations (in priority order)
 CONFIG_SEARCH_PATHS = [
@@ -20,17 +32,22 @@ class Config:
     
     _instance = None
     _config = None
+    _flat: Dict[str, Any] = {}
     
     def __new__(cls):
         """Singleton pattern - only one config instance."""
         if cls._instance is None:
-            cls._instance = super(Config, cls).__new__(cls)
+            with _LOAD_LOCK:
+                if cls._instance is None:
+                    cls._instance = super(Config, cls).__new__(cls)
         return cls._instance
     
     def __init__(self):
         """Initialize config by loading from file."""
         if self._config is None:
-            self.load()
+            with _LOAD_LOCK:
+                if self._config is None:
+                    self.load()
     
     def load(self, config_path: Optional[Path] = None):
         """Load configuration from YAML file.
@@ -48,12 +65,16 @@ class Config:
                     config_file = path
                     break
         
-        if config_file and config_file.exists():
-            with open(config_file) as f:
-                self._config = yaml.safe_load(f)
-        else:
-            # Use minimal defaults if no config file found
-            self._config = self._get_minimal_defaults()
+        with _LOAD_LOCK:
+            if config_file and config_file.exists():
+                config = _parse_config_file(config_file)
+            else:
+                # Use minimal defaults if no config file found
+                config = self._get_minimal_defaults()
+            # Publish the lookup table before the tree, so a reader that sees
+            # the new tree never sees stale flat values.
+            self._flat = _flatten(config)
+            self._config = config
     
     def _get_minimal_defaults(self) -> Dict:
         """Get minimal default configuration."""
@@ -155,20 +176,8 @@ class Config:
             >>> config.get('lightcurves.std1.bin_size_sec')
             0.125
         """
-        keys = key_path.split('.')
-        value = self._config
-        
-        for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
-                return default
-        
-        # Handle 'auto' workers
-        if value == 'auto' and 'worker' in key_path.lower():
-            return multiprocessing.cpu_count()
-        
-        return value
+        # Every path was precomputed by load(), 'auto' workers included.
+        return self._flat.get(key_path, default)
     
     def get_section(self, section: str) -> Dict:
         """Get entire configuration section.
@@ -231,6 +240,34 @@ class Config:
         
         return self.get(f'xspec.models.{model_name}', {})
 
+def _flatten(tree: Dict, prefix: str = '') -> Dict[str, Any]:
+    """Map every dot-separated key path in `tree` to its value, for Config.get.
+
+    Intermediate dicts are kept too (get('xspec.models') returns the dict),
+    and 'auto' under a key path mentioning workers is resolved to the CPU
+    count here, once.
+    """
+    flat: Dict[str, Any] = {}
+    for key, value in (tree or {}).items():
+        path = f"{prefix}{key}"
+        if value == 'auto' and 'worker' in path.lower():
+            value = multiprocessing.cpu_count()
+        flat[path] = value
+        if isinstance(value, dict):
+            flat.update(_flatten(value, path + '.'))
+    return flat
+
+def _parse_config_file(config_file: Path) -> Dict:
+    """Parse a YAML config file, reusing the result while it is unchanged."""
+    config_file = config_file.resolve()
+    key = (config_file, config_file.stat().st_mtime_ns)
+    cached = _PARSE_CACHE.get(key)
+    if cached is None:
+        with open(config_file) as f:
+            cached = yaml.load(f, Loader=_YAML_LOADER)
+        _PARSE_CACHE[key] = cached
+    return cached
+
 # Global config instance
 _config_instance = None
 
@@ -238,7 +275,9 @@ def get_config() -> Config:
     """Get global configuration instance."""
     global _config_instance
     if _config_instance is None:
-        _config_instance = Config()
+        with _LOAD_LOCK:
+            if _config_instance is None:
+                _config_instance = Config()
     return _config_instance
 
 def load_config(config_path: Optional[Path] = None):
@@ -1,21 +1,28 @@
-"""Core processing modules."""
+"""Core processing modules.
 
-from autorxte.core.download_01 import (
-    search_and_download, 
-    find_fastest_region, 
-    save_preferred_region,
-    load_preferred_region
-)
-from autorxte.core.preparation_02 import prepare_all_obsids
-from autorxte.core.organization_03 import organize_fits_files
-from autorxte.core.bitmasks_04 import (
-    copy_bitmask_to_results, list_available_bitmasks, print_bitmask_list,
-)
-from autorxte.core.filtering_05 import create_gti_filters
-from autorxte.core.extraction_06 import extract_all_events
-from autorxte.core.lightcurves_07 import generate_lightcurves
-from autorxte.core.spectra_08 import extract_spectra
-from autorxte.core.pds_09 import compute_pds
+Submodules are imported on first attribute access (PEP 562), so importing
+one step (e.g. `from autorxte.core import compute_pds`) does not pull in
+boto3/astropy/etc. for every other step.
+"""
+import importlib
+
+# Public name -> submodule that defines it.
+_EXPORTS = {
+    'search_and_download': 'download_01',
+    'find_fastest_region': 'download_01',
+    'save_preferred_region': 'download_01',
+    'load_preferred_region': 'download_01',
+    'prepare_all_obsids': 'preparation_02',
+    'organize_fits_files': 'organization_03',
+    'copy_bitmask_to_results': 'bitmasks_04',
+    'list_available_bitmasks': 'bitmasks_04',
+    'print_bitmask_list': 'bitmasks_04',
+    'create_gti_filters': 'filtering_05',
+    'extract_all_events': 'extraction_06',
+    'generate_lightcurves': 'lightcurves_07',
+    'extract_spectra': 'spectra_08',
+    'compute_pds': 'pds_09',
+}
 
 __all__ = [
     'search_and_download',
@@ -31,3 +38,16 @@ __all__ = [
     'extract_spectra',
     'compute_pds',
 ]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
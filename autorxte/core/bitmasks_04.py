@@ -11,17 +11,16 @@ except the time marker. Power users pick a more specific selection
 (detectors, layers, AND vs OR mode) by name with --bitmask.
 """
 import logging
-import re
+import os
 import shutil
 from pathlib import Path
 from typing import Optional, List, Dict
 
+from autorxte.utils import find_results_dirs
 from autorxte.utils.interactive import get_path, get_yes_no, get_input
 
 logger = logging.getLogger(__name__)
 
-OBSID_RE = re.compile(r'^\d{5}-\d{2}-\d{2}-\d{2}[A-Z]?$')
-
 # Filename downstream code (extraction_06) reads from Analysis/.
 CANONICAL_NAME = 'bitmask_event'
 
@@ -84,11 +83,22 @@ def resolve_bitmask(name_or_path: Optional[str]) -> Path:
     )
 
 
-def _is_results_dir_for_obsid(entry: Path) -> bool:
-    """True if entry is <obsid>-results where obsid matches the RXTE pattern."""
-    if not entry.is_dir() or not entry.name.endswith('-results'):
-        return False
-    return bool(OBSID_RE.match(entry.name[:-len('-results')]))
+def _place_bitmask(src: Path, dest: Path):
+    """Put a copy of `src` at `dest`, replacing any existing file.
+
+    Hardlinks when src and dest share a filesystem: the bitmask is only ever
+    read (by seextrct), and every Analysis/ then shares one inode instead of
+    holding its own copy. Falls back to a real copy across filesystems or
+    where links are not supported.
+    """
+    try:
+        dest.unlink()
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copy2(str(src), str(dest))
 
 
 def copy_bitmask_to_results(
@@ -116,7 +126,7 @@ def copy_bitmask_to_results(
     if not root_dir.is_dir():
         raise ValueError(f"Root directory does not exist: {root_dir}")
 
-    results_dirs = [e for e in sorted(root_dir.iterdir()) if _is_results_dir_for_obsid(e)]
+    results_dirs = find_results_dirs(root_dir)
     if not results_dirs:
         logger.warning(
             f"No <obsid>-results directories found under {root_dir}. "
@@ -139,7 +149,7 @@ def copy_bitmask_to_results(
             skipped += 1
             logger.info(f"SKIP {results_dir.name} (already has {CANONICAL_NAME})")
             continue
-        shutil.copy2(str(src), str(dest))
+        _place_bitmask(src, dest)
         copied += 1
         logger.info(f"OK   {results_dir.name}")
 
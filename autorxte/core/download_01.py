@@ -5,25 +5,31 @@ Download RXTE data from NASA HEASARC S3 archive.
 Supports both interactive mode and function arguments.
 """
 
+import os
 import re
 import json
+import hashlib
+import uuid
 import time
 import logging
+import statistics
 import threading
 import multiprocessing
 from pathlib import Path
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict, TYPE_CHECKING
+from collections import Counter
+from contextlib import contextmanager
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-import boto3
-import numpy as np
-from botocore import UNSIGNED
-from botocore.client import Config
-from astroquery.heasarc import Heasarc
-from astropy.time import Time
 from datetime import datetime
-from astropy.coordinates import SkyCoord
-from astropy import units as u
+
+# boto3/botocore, astroquery, astropy and numpy are imported inside the
+# functions that use them: together they take hundreds of ms to import, and
+# most entry points (saved-region lookups, --help, other pipeline steps) never
+# touch them.
+if TYPE_CHECKING:
+    from astropy.coordinates import SkyCoord
+    from astropy.table import Table
 
 from autorxte.utils.interactive import get_input, get_yes_no, get_path, get_float, get_int, get_choice
 
@@ -33,11 +39,27 @@ DEFAULT_BUCKET = 'nasa-heasarc'
 DEFAULT_REGION = 'us-east-1'
 DEFAULT_CATALOG = 'xtemaster'
 
+# Connections in the shared S3 client's urllib3 pool. choose_max_workers never
+# returns more workers than this, so file workers never wait on the pool.
+S3_MAX_POOL_CONNECTIONS = 64
+
+# Keys submitted to the download pool but not yet finished. Listers block
+# once this many are queued, so the number of in-flight downloads (futures
+# and their work items) stays bounded however deep a prefix is. The per-key
+# size/prefix maps still hold one small entry per listed key.
+S3_MAX_QUEUED_KEYS = 4096
+
 # HEASARC reorganised the bucket layout in the past (rxte/ -> xte/). Keep the
 # template in one place (and overridable from autorxte_config.yaml) so a future
 # move is a one-line config change, not a hunt through the code.
 DEFAULT_ARCHIVE_PREFIX = "xte/data/archive/{cycle}/{prnb}/{obsid}/"
 
+# Where resolved coordinates and HEASARC query results are cached, and for
+# how long. Both lookups are deterministic in their inputs, so re-runs of the
+# same search skip two slow network calls.
+QUERY_CACHE_DIR = Path.home() / '.autorxte'
+QUERY_CACHE_TTL = 7 * 24 * 3600  # seconds
+
 # AWS regions to test (major global endpoints)
 POSSIBLE_REGIONS = [
     # US
@@ -71,20 +93,41 @@ POSSIBLE_REGIONS = [
 ]
 
 
-def test_region_speed(bucket: str, region: str, test_key: str = 'rxte/') -> Optional[float]:
+def test_region_speed(bucket: str, region: str, test_key: str = 'rxte/',
+                      samples: int = 3) -> Optional[float]:
     """Test download speed from a specific region.
     
+    The first request pays for DNS, TCP and TLS setup, which says little
+    about steady-state transfers, so it is only a warm-up; the score comes
+    from the median of `samples` further requests on the same connection.
+    
     Returns:
-        Download speed in MB/s, or None if region doesn't work
+        Score = 1 / median request latency (higher is faster), or None if
+        the region doesn't work
     """
+    import boto3
+    from botocore import UNSIGNED
+    from botocore.client import Config
+    
     try:
-        s3 = boto3.client('s3', config=Config(signature_version=UNSIGNED), region_name=region)
+        # Short timeouts and no retries: a slow or dead region should drop
+        # out of the test, not stall it. Probes run concurrently, and
+        # boto3's default session isn't thread-safe, so each gets its own.
+        s3 = boto3.session.Session().client(
+            's3',
+            config=Config(signature_version=UNSIGNED, connect_timeout=5,
+                          read_timeout=5, retries={'max_attempts': 1}),
+            region_name=region,
+        )
+        s3.list_objects_v2(Bucket=bucket, Prefix=test_key, MaxKeys=1)
         
-        # List objects to test connectivity
-        start = time.time()
-        response = s3.list_objects_v2(Bucket=bucket, Prefix=test_key, MaxKeys=10)
-        elapsed = time.time() - start
+        latencies = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            s3.list_objects_v2(Bucket=bucket, Prefix=test_key, MaxKeys=1)
+            latencies.append(time.perf_counter() - start)
         
+        elapsed = statistics.median(latencies)
         if elapsed > 0:
             # Simple metric: 1/latency (faster = better)
             return 1.0 / elapsed
@@ -100,15 +143,19 @@ def find_fastest_region(bucket: str, regions: List[str] = POSSIBLE_REGIONS) -> s
     Returns:
         Fastest region name
     """
-    logger.info("Testing download speeds from different regions...")
+    logger.info(f"Testing download speeds from {len(regions)} regions...")
     
+    # Each probe is one network round-trip, so run them all at once; the whole
+    # test then takes about as long as the slowest region instead of the sum.
     speeds = {}
-    for region in regions:
-        logger.info(f"  Testing {region}...")
-        speed = test_region_speed(bucket, region)
-        if speed:
-            speeds[region] = speed
-            logger.info(f"    {region}: {speed:.2f} score")
+    with ThreadPoolExecutor(max_workers=max(1, len(regions))) as executor:
+        futures = {executor.submit(test_region_speed, bucket, r): r for r in regions}
+        for fut in as_completed(futures):
+            region = futures[fut]
+            speed = fut.result()
+            if speed:
+                speeds[region] = speed
+                logger.info(f"    {region}: {speed:.2f} score")
     
     if not speeds:
         logger.warning("No regions responded, using default us-east-1")
@@ -145,15 +192,179 @@ def load_preferred_region(config_path: Path = None) -> Optional[str]:
     return None
 
 
+def _query_cache_path(kind: str, suffix: str, *parts) -> Path:
+    """Cache file for a lookup keyed on `parts`, e.g. (source, catalog, radius)."""
+    key = hashlib.sha256('|'.join(str(p) for p in parts).encode()).hexdigest()
+    return QUERY_CACHE_DIR / f"{kind}_cache" / f"{key}{suffix}"
+
+
+def _fresh(path: Path) -> bool:
+    """True if `path` exists and is younger than QUERY_CACHE_TTL."""
+    try:
+        return time.time() - path.stat().st_mtime < QUERY_CACHE_TTL
+    except OSError:
+        return False
+
+
+def resolve_source(source: str, refresh: bool = False) -> 'SkyCoord':
+    """Resolve a source name (via Sesame/SIMBAD) or 'RA DEC' in degrees.
+
+    Name lookups are cached on disk for QUERY_CACHE_TTL; `refresh` forces a
+    new lookup.
+    """
+    from astropy.coordinates import SkyCoord
+    from astropy import units as u
+
+    if not re.search(r'[A-Za-z]', source):
+        return SkyCoord(source, unit=u.deg)
+
+    cache = _query_cache_path('coord', '.json', source)
+    if not refresh and _fresh(cache):
+        try:
+            with open(cache) as f:
+                data = json.load(f)
+            return SkyCoord(data['ra'], data['dec'], unit=u.deg)
+        except (OSError, ValueError, KeyError):
+            pass
+
+    pos = SkyCoord.from_name(source)
+    cache.parent.mkdir(parents=True, exist_ok=True)
+    _atomic_write_json(cache, {'source': source, 'ra': pos.ra.deg, 'dec': pos.dec.deg})
+    return pos
+
+
+def query_heasarc(pos: 'SkyCoord', source: str, catalog: str, radius: float,
+                  refresh: bool = False) -> 'Table':
+    """Query `catalog` around `pos` for the columns search_and_download needs.
+
+    Results are cached as ECSV for QUERY_CACHE_TTL, keyed on source, catalog
+    and radius; `refresh` forces a new query.
+    """
+    from astropy.table import Table
+    from astropy import units as u
+
+    cache = _query_cache_path('heasarc', '.ecsv', source, catalog, radius)
+    if not refresh and _fresh(cache):
+        try:
+            return Table.read(cache, format='ascii.ecsv')
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable HEASARC cache {cache}: {e}")
+
+    # Request the columns the rest of this module depends on, so we don't
+    # depend on astroquery's default column set including 'cycle'.
+    from astroquery.heasarc import Heasarc
+    tbl = Heasarc().query_region(
+        pos,
+        catalog=catalog,
+        radius=(radius / 60.0) * u.deg,
+        columns='__row, cycle, obsid, target_name, exposure, time',
+    )
+    cache.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        tbl.write(cache, format='ascii.ecsv', overwrite=True)
+    except Exception as e:
+        logger.debug(f"Could not cache HEASARC result: {e}")
+    return tbl
+
+
 def choose_max_workers(n_files: int, avg_size_kb: float) -> int:
     """Pick optimal thread count based on file count and size."""
     cpu = multiprocessing.cpu_count()
     if avg_size_kb < 500:
-        return min(n_files, max(8, cpu * 10), 64)
+        return min(n_files, max(8, cpu * 10), S3_MAX_POOL_CONNECTIONS)
     else:
         return min(n_files, max(4, cpu * 5), 32)
 
 
+def save_download_tuning(workers: int, config_path: Path = None):
+    """Save the download concurrency the last run converged on."""
+    if config_path is None:
+        config_path = Path.home() / '.autorxte' / 'download_tuning.json'
+    
+    config_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(config_path, 'w') as f:
+        json.dump({'workers': workers, 'saved_at': datetime.now().isoformat()}, f)
+
+
+def load_download_tuning(config_path: Path = None) -> Optional[int]:
+    """Load the concurrency saved by save_download_tuning, if any."""
+    if config_path is None:
+        config_path = Path.home() / '.autorxte' / 'download_tuning.json'
+    
+    try:
+        with open(config_path, 'r') as f:
+            return int(json.load(f)['workers'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+class _AdaptiveLimit:
+    """Concurrency gate whose limit can move while workers are running.
+    
+    The pool is created at the ceiling; each download holds a slot of this
+    gate, and a monitor thread steps `limit` up or down between 2 and the
+    ceiling based on measured throughput (see download_s3_prefixes).
+    """
+    
+    def __init__(self, limit: int, ceiling: int):
+        self.ceiling = ceiling
+        self.limit = max(min(2, ceiling), min(limit, ceiling))
+        # Limit in force during the fastest tuning window; what gets saved.
+        # None until the tuner has measured a window.
+        self.best_limit: Optional[int] = None
+        self._active = 0
+        self._cond = threading.Condition()
+    
+    def __enter__(self):
+        with self._cond:
+            while self._active >= self.limit:
+                self._cond.wait()
+            self._active += 1
+    
+    def __exit__(self, *exc):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify()
+    
+    def set_limit(self, limit: int):
+        with self._cond:
+            self.limit = max(min(2, self.ceiling), min(limit, self.ceiling))
+            self._cond.notify_all()
+
+
+def _tune_limit(gate: _AdaptiveLimit, bytes_done, n_pending, stop: threading.Event,
+                interval: float = 5.0):
+    """Hill-climb gate.limit on throughput: sample bytes/s every `interval`;
+    +2 workers after a >10% gain, -2 after a >10% drop, else hold.
+
+    While fewer files are pending than the limit allows (listing still
+    catching up, or the tail of the run) the rate says nothing about the
+    limit, so tuning pauses. gate.best_limit tracks the limit of the fastest
+    window, so the drop as the last files finish isn't what gets saved;
+    it stays None if no window was measured.
+    """
+    last_bytes = bytes_done()
+    last_rate = None
+    best_rate = 0.0
+    while not stop.wait(interval):
+        now_bytes = bytes_done()
+        rate = (now_bytes - last_bytes) / interval
+        last_bytes = now_bytes
+        if n_pending() < gate.limit:
+            last_rate = None
+            continue
+        if rate > best_rate:
+            best_rate = rate
+            gate.best_limit = gate.limit
+        if last_rate:
+            if rate > last_rate * 1.1:
+                gate.set_limit(gate.limit + 2)
+            elif rate < last_rate * 0.9:
+                gate.set_limit(gate.limit - 2)
+            logger.debug(f"{rate / (1 << 20):.2f} MB/s -> {gate.limit} workers")
+        last_rate = rate
+
+
 def human_readable_size(n_bytes: int) -> str:
     """Convert bytes to human-readable string."""
     if n_bytes >= 1 << 30:
@@ -162,6 +373,83 @@ def human_readable_size(n_bytes: int) -> str:
         return f"{n_bytes / (1 << 20):.2f} MB"
 
 
+def _load_record(record_file: Path) -> set:
+    """Keys already downloaded: the consolidated JSON list plus any keys
+    still in its .jsonl journal (left behind if a run was interrupted)."""
+    downloaded = set()
+    if record_file.exists():
+        with open(record_file, 'r') as rf:
+            downloaded = set(json.load(rf))
+    journal = record_file.with_suffix('.jsonl')
+    if journal.exists():
+        with open(journal, 'r') as jf:
+            for line in jf:
+                try:
+                    downloaded.add(json.loads(line))
+                except ValueError:
+                    # Torn last line from a crash mid-append.
+                    pass
+    return downloaded
+
+
+def _atomic_write_json(path: Path, data):
+    """Write compact JSON to a unique temp file, fsync it, then os.replace
+    it over `path`, so a crash never leaves a truncated record behind."""
+    tmp = path.with_name(f"{path.name}.tmp.{uuid.uuid4().hex}")
+    try:
+        with open(tmp, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+@contextmanager
+def _record_lock(record_file: Path, timeout: float = 3.0):
+    """Hold an exclusive flock on `<record>.lock` while the record is
+    read-modified-written, so concurrent runs sharing a download dir don't
+    drop each other's keys. If the lock can't be had within `timeout` (or
+    on platforms without fcntl) carry on unlocked rather than stall."""
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    with open(record_file.with_suffix('.lock'), 'a') as lf:
+        deadline = time.monotonic() + timeout
+        locked = False
+        while True:
+            try:
+                fcntl.flock(lf.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                locked = True
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    logger.warning(f"Could not lock {record_file.name}; "
+                                   f"updating it unlocked")
+                    break
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            if locked:
+                fcntl.flock(lf.fileno(), fcntl.LOCK_UN)
+
+
+def _consolidate_record(record_file: Path, downloaded: set):
+    """Fold the journal into the JSON record and remove the journal.
+
+    Keys recorded meanwhile by another run sharing the record are merged
+    in, not overwritten.
+    """
+    with _record_lock(record_file):
+        merged = _load_record(record_file) | downloaded
+        _atomic_write_json(record_file, sorted(merged))
+        record_file.with_suffix('.jsonl').unlink(missing_ok=True)
+
+
 def download_s3_prefix(
     s3_client,
     prefix: str,
@@ -171,70 +459,209 @@ def download_s3_prefix(
     overwrite: bool = False
 ) -> Tuple[int, float]:
     """Download everything under an S3 prefix."""
-    paginator = s3_client.get_paginator('list_objects_v2')
-    objs = []
-    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
-        objs.extend(page.get('Contents', []))
-    
-    keys = [o['Key'] for o in objs]
-    sizes = {o['Key']: o['Size'] for o in objs}
-    total_bytes = sum(sizes.values())
-
-    if not keys:
-        # Common cause: archive layout changed (HEASARC moved rxte/ -> xte/ once
-        # already). Surface it loudly so it is not silently treated as success.
-        logger.warning(
-            f"S3 listing for prefix {prefix!r} returned 0 files. "
-            f"If this is unexpected, the bucket layout may have changed. "
-            f"Try: aws s3 ls --no-sign-request s3://{bucket}/  to inspect."
-        )
-        return 0, 0.0
-
-    logger.info(f"Found {len(keys)} files ({human_readable_size(total_bytes)})")
+    per_prefix, duration = download_s3_prefixes(
+        s3_client, [(prefix, local_dir)], record_file,
+        bucket=bucket, overwrite=overwrite,
+    )
+    return per_prefix.get(prefix, 0), duration
 
-    if overwrite and record_file.exists():
-        record_file.unlink()
 
-    downloaded = set()
-    if record_file.exists():
-        with open(record_file, 'r') as rf:
-            downloaded = set(json.load(rf))
-
-    avg_kb = (total_bytes / len(keys) / 1024) if keys else 0
-    workers = choose_max_workers(len(keys), avg_kb)
-    logger.info(f"Using {workers} parallel workers")
+def download_s3_prefixes(
+    s3_client,
+    prefixes: List[Tuple[str, Path]],
+    record_file: Path,
+    bucket: str = DEFAULT_BUCKET,
+    overwrite: bool = False
+) -> Tuple[Dict[str, int], float]:
+    """Download everything under several S3 prefixes through one worker pool.
+    
+    `prefixes` is a list of (prefix, local_dir) pairs, one per ObsID. All of
+    their keys share a single ThreadPoolExecutor, so small ObsIDs don't each
+    pay for a pool of their own and the pool stays busy across ObsID
+    boundaries. The prefixes are listed concurrently, and keys are submitted
+    page by page as each listing arrives, so downloads start after the first
+    listing round-trip rather than after the last one.
+    
+    Returns:
+        ({prefix: bytes downloaded}, total seconds spent downloading)
+    """
+    from boto3.s3.transfer import TransferConfig
+    
+    journal = record_file.with_suffix('.jsonl')
+    if overwrite:
+        record_file.unlink(missing_ok=True)
+        journal.unlink(missing_ok=True)
+    
+    downloaded = _load_record(record_file)
+    
+    paginator = s3_client.get_paginator('list_objects_v2')
+    sizes: Dict[str, int] = {}
+    key_prefix: Dict[str, str] = {}
+    local_dirs = dict(prefixes)
     
     lock = threading.Lock()
+    listed_bytes = 0
     downloaded_bytes = 0
+    # Bytes of keys already in the record. Counted toward the progress line
+    # only; downloaded_bytes stays this run's transfer so the tuner measures
+    # real throughput.
+    resumed_bytes = 0
+    n_resumed = 0
+    # Keys submitted but not yet finished; the tuner holds when this runs low.
+    n_pending = 0
+    per_prefix: Counter = Counter()
     start_time = time.time()
+    executor = None
+    jf = None
+    transfer_cfg = None
+    gate = None
+    stop_tuning = threading.Event()
     
     def worker(key):
+        nonlocal n_pending
+        try:
+            fetch(key)
+        finally:
+            with lock:
+                n_pending -= 1
+            queued.release()
+    
+    def fetch(key):
         nonlocal downloaded_bytes
-        if key in downloaded:
-            return
-        dest = local_dir / key[len(prefix):].lstrip('/')
-        dest.parent.mkdir(parents=True, exist_ok=True)
+        prefix = key_prefix[key]
+        dest = local_dirs[prefix] / key[len(prefix):].lstrip('/')
         try:
-            s3_client.download_file(bucket, key, str(dest))
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            with gate:
+                s3_client.download_file(bucket, key, str(dest), Config=transfer_cfg)
             with lock:
                 downloaded.add(key)
                 downloaded_bytes += sizes[key]
-                with open(record_file, 'w') as rf:
-                    json.dump(sorted(downloaded), rf, indent=2)
-                pct = downloaded_bytes / total_bytes * 100
-                print(f"\r  {human_readable_size(downloaded_bytes)} / "
-                      f"{human_readable_size(total_bytes)} ({pct:.1f}%)", end='', flush=True)
+                per_prefix[prefix] += sizes[key]
+                # One short append per file; the full record is rewritten
+                # only once, after the pool finishes.
+                jf.write(json.dumps(key) + '\n')
+                jf.flush()
+                done = resumed_bytes + downloaded_bytes
+                pct = done / listed_bytes * 100
+                print(f"\r  {human_readable_size(done)} / "
+                      f"{human_readable_size(listed_bytes)} listed ({pct:.1f}%)",
+                      end='', flush=True)
         except Exception as e:
             logger.error(f"Failed {key}: {e}")
     
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        futures = [executor.submit(worker, k) for k in keys]
-        for _ in as_completed(futures):
-            pass
+    def start_pool(pending):
+        # Size the pool from the first page with work. Threads are only
+        # started as work is queued, so the file count does not need to be
+        # known up front, and a fully resumed run never starts a pool.
+        # choose_max_workers gives the ceiling; the number actually
+        # downloading starts at the last run's converged value (or
+        # min(cpu, 16)) and is tuned on measured throughput.
+        nonlocal executor, jf, transfer_cfg, gate, start_time
+        avg_kb = sum(sizes[k] for k in pending) / len(pending) / 1024
+        workers = choose_max_workers(1 << 30, avg_kb)
+        start = load_download_tuning() or min(multiprocessing.cpu_count(), 16)
+        gate = _AdaptiveLimit(start, workers)
+        threading.Thread(
+            target=_tune_limit,
+            args=(gate, lambda: downloaded_bytes, lambda: n_pending, stop_tuning),
+            daemon=True,
+        ).start()
+        logger.info(f"Using {gate.limit} parallel workers (up to {workers})")
+        # Files above 8 MB are fetched as parallel 8 MB range GETs. Split
+        # the client's connection pool between the file workers so the range
+        # threads of a few large science files don't queue behind each other.
+        transfer_cfg = TransferConfig(
+            multipart_threshold=8 * 1024 * 1024,
+            multipart_chunksize=8 * 1024 * 1024,
+            max_concurrency=max(2, S3_MAX_POOL_CONNECTIONS // workers),
+            use_threads=True,
+        )
+        # The journal is only opened once there is something to download,
+        # so listing nothing (or resuming everything) leaves no file behind.
+        jf = open(journal, 'a')
+        start_time = time.time()
+        executor = ThreadPoolExecutor(max_workers=workers)
+    
+    def list_prefix(prefix) -> int:
+        """Page through one prefix, handing its pending keys to the download
+        pool as each page arrives. Returns the number of new keys listed."""
+        nonlocal listed_bytes, resumed_bytes, n_resumed, n_pending
+        n_listed = 0
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix,
+                                       PaginationConfig={'PageSize': 1000}):
+            pending = []
+            with lock:
+                for o in page.get('Contents', []):
+                    key = o['Key']
+                    if key in sizes:
+                        continue
+                    sizes[key] = o['Size']
+                    key_prefix[key] = prefix
+                    listed_bytes += o['Size']
+                    n_listed += 1
+                    if key in downloaded:
+                        # Resumed: no future, no worker wake-up.
+                        resumed_bytes += o['Size']
+                        n_resumed += 1
+                    else:
+                        pending.append(key)
+                        n_pending += 1
+            if not pending:
+                continue
+            with pool_lock:
+                if executor is None:
+                    start_pool(pending)
+            for key in pending:
+                queued.acquire()
+                try:
+                    executor.submit(worker, key)
+                except BaseException:
+                    queued.release()
+                    raise
+        return n_listed
+    
+    # Listing is one round-trip per 1000 keys per prefix; run the prefixes'
+    # listings side by side so many small ObsIDs don't list one after another.
+    pool_lock = threading.Lock()
+    queued = threading.BoundedSemaphore(S3_MAX_QUEUED_KEYS)
+    try:
+        with ThreadPoolExecutor(max_workers=min(16, len(prefixes) or 1)) as listers:
+            futures = {listers.submit(list_prefix, prefix): prefix
+                       for prefix, _local_dir in prefixes}
+            for fut in as_completed(futures):
+                if fut.result() == 0:
+                    # Common cause: archive layout changed (HEASARC moved
+                    # rxte/ -> xte/ once already). Surface it loudly so it
+                    # is not silently treated as success.
+                    logger.warning(
+                        f"S3 listing for prefix {futures[fut]!r} returned 0 files. "
+                        f"If this is unexpected, the bucket layout may have changed. "
+                        f"Try: aws s3 ls --no-sign-request s3://{bucket}/  to inspect."
+                    )
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+        stop_tuning.set()
+        if jf is not None:
+            jf.close()
+    
+    if gate is not None and gate.best_limit is not None:
+        save_download_tuning(gate.best_limit)
     
+    if not sizes:
+        return {}, 0.0
+    
+    _consolidate_record(record_file, downloaded)
     duration = time.time() - start_time
-    print()
-    return downloaded_bytes, duration
+    if executor is not None:
+        print()
+    if n_resumed:
+        logger.info(f"Skipped {n_resumed} files ({human_readable_size(resumed_bytes)}) "
+                    f"already in {record_file.name}")
+    logger.info(f"Listed {len(sizes)} files ({human_readable_size(listed_bytes)}) "
+                f"under {len(prefixes)} prefixes")
+    return dict(per_prefix), duration
 
 
 def search_and_download(
@@ -251,6 +678,7 @@ def search_and_download(
     overwrite: Optional[bool] = None,
     bucket: Optional[str] = None,
     region: Optional[str] = None,
+    refresh: bool = False,
     interactive: bool = True
 ):
     """
@@ -275,8 +703,16 @@ def search_and_download(
         overwrite: Re-download existing files
         bucket: S3 bucket name (default: nasa-heasarc)
         region: AWS S3 region (default: us-east-1)
+        refresh: Ignore cached name resolution / HEASARC results (kept under
+            ~/.autorxte for 7 days) and query again
         interactive: Enable interactive prompts for missing arguments
     """
+    import boto3
+    import numpy as np
+    from botocore import UNSIGNED
+    from botocore.client import Config
+    from astropy.time import Time
+    
     # Get config defaults
     from autorxte.config import get_config
     config = get_config()
@@ -350,20 +786,25 @@ def search_and_download(
         if output_dir is None:
             output_dir = Path('.')
 
-    # S3 client. Pool size matches the worker cap in choose_max_workers (64) so
-    # parallel downloads don't trigger urllib3 "connection pool full" warnings.
+    # One S3 client for the whole run, shared by every download thread (boto3
+    # clients are thread-safe). Pool size matches the worker cap in
+    # choose_max_workers so parallel downloads don't trigger urllib3
+    # "connection pool full" warnings; TCP keep-alive and adaptive retries keep
+    # long runs on warm connections and back off under S3 throttling.
     s3 = boto3.client(
         's3',
-        config=Config(signature_version=UNSIGNED, max_pool_connections=64),
+        config=Config(
+            signature_version=UNSIGNED,
+            max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+            tcp_keepalive=True,
+            retries={'mode': 'adaptive', 'max_attempts': 5},
+        ),
         region_name=region,
     )
 
     # Parse position
     try:
-        if bool(re.search(r'[A-Za-z]', source)):
-            pos = SkyCoord.from_name(source)
-        else:
-            pos = SkyCoord(source, unit=u.deg)
+        pos = resolve_source(source, refresh=refresh)
     except Exception as e:
         logger.error(f"Could not resolve source '{source}': {e}")
         logger.error("Try using coordinates like '83.633 22.015' instead")
@@ -371,16 +812,9 @@ def search_and_download(
 
     logger.info(f"Searching {source} (RA={pos.ra.deg:.3f}, Dec={pos.dec.deg:.3f})")
 
-    # Query HEASARC. Request the columns the rest of this function depends on,
-    # so we don't depend on astroquery's default column set including 'cycle'.
-    heas = Heasarc()
+    # Query HEASARC.
     try:
-        tbl = heas.query_region(
-            pos,
-            catalog=catalog,
-            radius=(radius / 60.0) * u.deg,
-            columns='__row, cycle, obsid, target_name, exposure, time',
-        )
+        tbl = query_heasarc(pos, source, catalog, radius, refresh=refresh)
     except Exception as e:
         logger.error(f"HEASARC query failed: {e}")
         raise
@@ -401,12 +835,13 @@ def search_and_download(
         if min_exposure is not None:
             mask &= tbl['exposure'].astype(float) >= min_exposure
         if start_date or end_date:
-            times = Time(tbl['time'], format='mjd')
-            times_dt = [datetime.fromisoformat(str(t.iso)) for t in times]
+            # Compare as MJD floats in one vectorized pass instead of building
+            # a datetime per row.
+            mjd = np.asarray(tbl['time'], dtype=float)
             if start_date:
-                mask &= np.array([t >= datetime.fromisoformat(start_date) for t in times_dt])
+                mask &= mjd >= Time(start_date).mjd
             if end_date:
-                mask &= np.array([t <= datetime.fromisoformat(end_date) for t in times_dt])
+                mask &= mjd <= Time(end_date).mjd
         tbl = tbl[mask]
         logger.info(f"After filters: {len(tbl)} observations")
 
@@ -438,7 +873,7 @@ def search_and_download(
     
     # Select observations
     if obsids:
-        links_data = tbl[[str(row['obsid']) in obsids for row in tbl]]
+        links_data = tbl[np.isin(np.asarray(tbl['obsid']).astype(str), obsids)]
     elif top_n:
         tbl.sort('exposure')
         links_data = tbl[-top_n:]
@@ -470,23 +905,26 @@ def search_and_download(
     # Resolve archive prefix template once, from config (with hard-coded default).
     archive_template = config.get('download.s3.archive_prefix', DEFAULT_ARCHIVE_PREFIX)
 
-    # Download all
+    # Download all ObsIDs through one shared worker pool.
+    record_file = download_dir / f"downloaded_RXTE_{safe_name}.json"
+    jobs = []
     for row in links_data:
         cycle = "AO" + str(row['cycle'])
         obsid = str(row['obsid'])
         prnb = 'P' + obsid[:5]
         prefix = archive_template.format(cycle=cycle, prnb=prnb, obsid=obsid)
-
-        logger.info(f"Downloading ObsID {obsid}")
-        obs_dir = download_dir / obsid
-        record_file = download_dir / f"downloaded_RXTE_{safe_name}.json"
-        
-        bytes_dl, secs = download_s3_prefix(s3, prefix, obs_dir, record_file, bucket=bucket, overwrite=overwrite)
-        speed = bytes_dl / secs if secs > 0 else 0
-        logger.info(f"ObsID {obsid}: {human_readable_size(bytes_dl)} in {secs:.1f}s "
-                    f"({human_readable_size(speed)}/s)")
+        jobs.append((obsid, prefix))
     
-    logger.info("All downloads complete")
+    per_prefix, secs = download_s3_prefixes(
+        s3, [(prefix, download_dir / obsid) for obsid, prefix in jobs],
+        record_file, bucket=bucket, overwrite=overwrite,
+    )
+    for obsid, prefix in jobs:
+        logger.info(f"ObsID {obsid}: {human_readable_size(per_prefix.get(prefix, 0))}")
+    bytes_dl = sum(per_prefix.values())
+    speed = bytes_dl / secs if secs > 0 else 0
+    logger.info(f"All downloads complete: {human_readable_size(bytes_dl)} in {secs:.1f}s "
+                f"({human_readable_size(speed)}/s)")
 
 
 if __name__ == '__main__':
@@ -501,6 +939,8 @@ if __name__ == '__main__':
     parser.add_argument('--min-exposure', type=float)
     parser.add_argument('--top-n', type=int)
     parser.add_argument('--overwrite', action='store_true')
+    parser.add_argument('--refresh-cache', action='store_true',
+                        help='Re-query SIMBAD/HEASARC instead of using cached results')
     parser.add_argument('--no-interactive', action='store_true', help='Disable interactive mode')
     
     args = parser.parse_args()
@@ -513,5 +953,6 @@ if __name__ == '__main__':
         min_exposure=args.min_exposure,
         top_n=args.top_n,
         overwrite=args.overwrite,
+        refresh=args.refresh_cache,
         interactive=not args.no_interactive
     )
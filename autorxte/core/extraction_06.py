@@ -13,19 +13,34 @@ make both work, seextrct is run with cwd set to the parent of root_dir
 """
 import logging
 import multiprocessing
-import re
+import os
 from pathlib import Path
 from typing import Optional, List, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from astropy.io import fits
 
-from autorxte.utils import run_heasoft_pty, HEASoftToolError, require_heasoft_tool
+from autorxte.utils import (
+    run_heasoft_pty, HEASoftToolError, require_heasoft_tool, find_results_dirs,
+)
 from autorxte.utils.interactive import get_path, get_input, get_yes_no, get_int
 
 logger = logging.getLogger(__name__)
 
-OBSID_RE = re.compile(r'^\d{5}-\d{2}-\d{2}-\d{2}[A-Z]?$')
+# seextrct is mostly FITS I/O. Past this many concurrent runs the (often
+# shared/network) filesystem is the bottleneck and more workers only add
+# contention.
+MAX_DEFAULT_WORKERS = 16
+
+
+def _default_workers() -> int:
+    """CPUs this process may run on (honours taskset/cgroup cpusets),
+    capped at MAX_DEFAULT_WORKERS."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = multiprocessing.cpu_count()
+    return max(1, min(cpus, MAX_DEFAULT_WORKERS))
 
 
 def split_gti(gti_path: Path, sep_dir: Path) -> List[Path]:
@@ -34,10 +49,10 @@ def split_gti(gti_path: Path, sep_dir: Path) -> List[Path]:
     Returns the list of split GTI paths (sorted). If sep_dir already has
     the right count, returns the existing files without rebuilding.
 
-    Note: the pre-repo script used `cols = Column(...); cols += Column(...)`
-    which does not work — fits.Column does not implement __iadd__. The
-    correct pattern is to build a list of Columns and pass it to
-    BinTableHDU.from_columns(); that's what we do here.
+    Each output is a one-row slice (a view) of the input table written under
+    the input's own extension header, so no Columns are rebuilt per row;
+    astropy fixes NAXIS2 from the slice on write. Those headers were just
+    read from a valid file, so output verification is skipped.
     """
     with fits.open(gti_path) as hdul:
         data = hdul[1].data
@@ -48,30 +63,18 @@ def split_gti(gti_path: Path, sep_dir: Path) -> List[Path]:
             return existing
 
         out: List[Path] = []
-        col0 = hdul[1].columns[0]
-        col1 = hdul[1].columns[1]
         primary_hdu = hdul[0].copy()
         ext_header = hdul[1].header
 
-        for idx, row in enumerate(data, start=1):
-            cols = [
-                fits.Column(name=col0.name, format=col0.format, array=[row[0]]),
-                fits.Column(name=col1.name, format=col1.format, array=[row[1]]),
-            ]
-            tbl = fits.BinTableHDU.from_columns(cols, header=ext_header)
+        for idx in range(1, nrows + 1):
+            tbl = fits.BinTableHDU(data=data[idx - 1:idx], header=ext_header)
             hdu = fits.HDUList([primary_hdu, tbl])
             out_path = sep_dir / f"good_{idx}.gti"
-            hdu.writeto(out_path, overwrite=True)
+            hdu.writeto(out_path, overwrite=True, output_verify='ignore')
             out.append(out_path)
         return out
 
 
-def _is_results_dir_for_obsid(entry: Path) -> bool:
-    if not entry.is_dir() or not entry.name.endswith('-results'):
-        return False
-    return bool(OBSID_RE.match(entry.name[:-len('-results')]))
-
-
 def _build_seextrct_script(
     infile_at_path: str,
     gti_file: Path,
@@ -128,6 +131,7 @@ def run_seextrct_single(
             cwd=seext_cwd,
             timeout=timeout,
             must_exist=[lc_file],
+            keep_output=False,
         )
         return f"{obsid}/{evt_prefix}"
     except HEASoftToolError as e:
@@ -135,6 +139,57 @@ def run_seextrct_single(
         raise
 
 
+def _discover_tasks(
+    results_dir: Path,
+    infile_rel: str,
+    prefix: str,
+    bitmask: str,
+    split_gti_flag: bool,
+    skip_existing: bool,
+) -> List[Tuple[Path, str, Path, str, str]]:
+    """Check one results dir's inputs and return its seextrct tasks.
+
+    Missing prerequisites are logged and yield no tasks. With split_gti_flag
+    the GTI split happens here, so its FITS writes overlap with extraction
+    of other obsids.
+    """
+    analysis = results_dir / "Analysis"
+    if not analysis.is_dir():
+        logger.warning(f"{results_dir.name}: no Analysis/; run 'organize' first")
+        return []
+
+    # Required inputs.
+    infile_path = results_dir / infile_rel
+    gti_main = analysis / "good.gti"
+    bitmask_path = analysis / bitmask
+
+    if not infile_path.exists():
+        logger.warning(f"{results_dir.name}: missing {infile_rel}; run 'organize' first")
+        return []
+    if not gti_main.exists():
+        logger.warning(f"{results_dir.name}: missing Analysis/good.gti; run 'filter' first")
+        return []
+    if not bitmask_path.exists():
+        logger.warning(f"{results_dir.name}: missing Analysis/{bitmask}; run 'bitmask' first")
+        return []
+
+    gtis = (
+        split_gti(gti_main, results_dir / "sep_gtis")
+        if split_gti_flag else [gti_main]
+    )
+
+    tasks = []
+    for gti in gtis:
+        row = gti.stem.split('_')[-1] if gti != gti_main else ''
+        evt_prefix = prefix + (f"_{row}" if row else '')
+        lc_file = analysis / f"{evt_prefix}.lc"
+        if skip_existing and lc_file.exists() and lc_file.stat().st_size > 0:
+            logger.info(f"SKIP {results_dir.name[:-len('-results')]}/{evt_prefix}")
+            continue
+        tasks.append((results_dir, infile_rel, gti, evt_prefix, bitmask))
+    return tasks
+
+
 def extract_all_events(
     root_dir: Optional[Path] = None,
     prefix: Optional[str] = None,
@@ -154,7 +209,7 @@ def extract_all_events(
         prefix = get_input("Base event name", "event", prefix)
         bitmask = get_input("Bitmask filename", "bitmask_event", bitmask)
         split_gti_flag = get_yes_no("Use separated (per-row) GTIs?", False, split_gti_flag)
-        workers = get_int("Parallel workers", multiprocessing.cpu_count(), workers)
+        workers = get_int("Parallel workers", _default_workers(), workers)
         skip_existing = get_yes_no(
             "Skip obsids whose <prefix>.lc already exists?", True, skip_existing
         )
@@ -164,7 +219,7 @@ def extract_all_events(
         prefix = prefix or "event"
         bitmask = bitmask or "bitmask_event"
         split_gti_flag = split_gti_flag if split_gti_flag is not None else False
-        workers = workers or multiprocessing.cpu_count()
+        workers = workers or _default_workers()
         skip_existing = skip_existing if skip_existing is not None else True
 
     if not root_dir.is_dir():
@@ -180,58 +235,40 @@ def extract_all_events(
     # paths in newer .god files are unaffected.
     seext_cwd = root_dir.parent.resolve()
 
-    # Build the task list.
-    tasks: List[Tuple[Path, str, Path, str, str]] = []
-    for results_dir in sorted(root_dir.iterdir()):
-        if not _is_results_dir_for_obsid(results_dir):
-            continue
-
-        analysis = results_dir / "Analysis"
-        if not analysis.is_dir():
-            logger.warning(f"{results_dir.name}: no Analysis/; run 'organize' first")
-            continue
-
-        # Required inputs.
-        infile_path = results_dir / infile_rel
-        gti_main = analysis / "good.gti"
-        bitmask_path = analysis / bitmask
-
-        if not infile_path.exists():
-            logger.warning(f"{results_dir.name}: missing {infile_rel}; run 'organize' first")
-            continue
-        if not gti_main.exists():
-            logger.warning(f"{results_dir.name}: missing Analysis/good.gti; run 'filter' first")
-            continue
-        if not bitmask_path.exists():
-            logger.warning(f"{results_dir.name}: missing Analysis/{bitmask}; run 'bitmask' first")
-            continue
+    results_dirs = find_results_dirs(root_dir)
 
-        gtis = (
-            split_gti(gti_main, results_dir / "sep_gtis")
-            if split_gti_flag else [gti_main]
-        )
+    # Discovery (stat checks plus the optional GTI split) is metadata-heavy
+    # and slow on network filesystems, so it runs on its own pool and each
+    # obsid's tasks are handed to the seextrct pool as soon as they're known.
+    discover_workers = min(32, multiprocessing.cpu_count() * 4)
+    logger.info(f"Scanning {len(results_dirs)} results dirs; extracting with "
+                f"{workers} workers (cwd={seext_cwd})")
 
-        for gti in gtis:
-            row = gti.stem.split('_')[-1] if gti != gti_main else ''
-            evt_prefix = prefix + (f"_{row}" if row else '')
-            lc_file = analysis / f"{evt_prefix}.lc"
-            if skip_existing and lc_file.exists() and lc_file.stat().st_size > 0:
-                logger.info(f"SKIP {results_dir.name[:-len('-results')]}/{evt_prefix}")
+    failures = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor, \
+            ThreadPoolExecutor(max_workers=discover_workers) as discovery:
+        found = {
+            discovery.submit(
+                _discover_tasks, results_dir, infile_rel, prefix, bitmask,
+                split_gti_flag, skip_existing,
+            ): results_dir
+            for results_dir in results_dirs
+        }
+        futures = {}
+        for fut in as_completed(found):
+            try:
+                dir_tasks = fut.result()
+            except Exception as e:
+                logger.error(f"FAIL {found[fut].name}: {type(e).__name__}: {e}")
                 continue
-            tasks.append((results_dir, infile_rel, gti, evt_prefix, bitmask))
+            for task in dir_tasks:
+                futures[executor.submit(run_seextrct_single, *task, seext_cwd)] = task
 
-    if not tasks:
-        logger.warning("No work to do (everything skipped, or no valid obsids).")
-        return
+        if not futures:
+            logger.warning("No work to do (everything skipped, or no valid obsids).")
+            return
+        logger.info(f"Extracting {len(futures)} files")
 
-    logger.info(f"Extracting {len(tasks)} files with {workers} workers (cwd={seext_cwd})")
-
-    failures = 0
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        futures = {
-            executor.submit(run_seextrct_single, *task, seext_cwd): task
-            for task in tasks
-        }
         for fut in as_completed(futures):
             try:
                 logger.info(f"OK   {fut.result()}")
@@ -244,9 +281,9 @@ def extract_all_events(
                 failures += 1
 
     if failures:
-        logger.warning(f"Done with {failures}/{len(tasks)} failures.")
+        logger.warning(f"Done with {failures}/{len(futures)} failures.")
     else:
-        logger.info(f"Done. Extracted {len(tasks)} event files.")
+        logger.info(f"Done. Extracted {len(futures)} event files.")
 
 
 if __name__ == '__main__':
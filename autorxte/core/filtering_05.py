@@ -6,18 +6,17 @@ Time Interval table that downstream extraction uses.
 """
 import logging
 import multiprocessing
-import re
 from pathlib import Path
 from typing import Optional, List
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from autorxte.utils import run_heasoft_pty, HEASoftToolError, require_heasoft_tool
+from autorxte.utils import (
+    run_heasoft_pty, HEASoftToolError, require_heasoft_tool, find_results_dirs,
+)
 from autorxte.utils.interactive import get_path, get_input, get_int, get_yes_no
 
 logger = logging.getLogger(__name__)
 
-OBSID_RE = re.compile(r'^\d{5}-\d{2}-\d{2}-\d{2}[A-Z]?$')
-
 DEFAULT_FILTER = (
     "(ELV > 4) && (OFFSET < 0.1) && (NUM_PCU_ON > 0) "
     "&& .NOT. ISNULL(ELV) && (NUM_PCU_ON < 6)"
@@ -48,12 +47,6 @@ def _resolve_xfl_path(line: str, results_dir: Path) -> Path:
     )
 
 
-def _is_results_dir_for_obsid(entry: Path) -> bool:
-    if not entry.is_dir() or not entry.name.endswith('-results'):
-        return False
-    return bool(OBSID_RE.match(entry.name[:-len('-results')]))
-
-
 def filter_single_obsid(
     results_dir: Path,
     filter_expression: str,
@@ -104,6 +97,7 @@ def filter_single_obsid(
             input_text=script,
             timeout=timeout,
             must_exist=[gti_file],
+            keep_output=False,
         )
         logger.info(f"OK   {obsid}")
         return obsid
@@ -142,9 +136,7 @@ def create_gti_filters(
     if not root_dir.is_dir():
         raise ValueError(f"Root directory does not exist: {root_dir}")
 
-    results_dirs = [
-        e for e in sorted(root_dir.iterdir()) if _is_results_dir_for_obsid(e)
-    ]
+    results_dirs = find_results_dirs(root_dir)
     if not results_dirs:
         logger.warning(
             f"No <obsid>-results directories found under {root_dir}. "
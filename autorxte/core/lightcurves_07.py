@@ -16,30 +16,23 @@ into Analysis/ afterwards.
 """
 import logging
 import multiprocessing
-import re
 import shutil
 import tempfile
 from pathlib import Path
-from typing import Optional, Literal, List, Tuple
+from typing import Callable, Optional, Literal, List, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from autorxte.utils import run_heasoft_pty, HEASoftToolError, require_heasoft_tool
+from autorxte.utils import (
+    run_heasoft_pty, HEASoftToolError, require_heasoft_tool, find_results_dirs,
+)
 from autorxte.utils.interactive import get_path, get_input, get_int, get_yes_no, get_choice
 
 logger = logging.getLogger(__name__)
 
-OBSID_RE = re.compile(r'^\d{5}-\d{2}-\d{2}-\d{2}[A-Z]?$')
-
 DEFAULT_STD1_LC_NAME = "std1.lc"
 DEFAULT_STD2_LC_NAME = "light.lc"
 
 
-def _is_results_dir_for_obsid(entry: Path) -> bool:
-    if not entry.is_dir() or not entry.name.endswith('-results'):
-        return False
-    return bool(OBSID_RE.match(entry.name[:-len('-results')]))
-
-
 def _build_pcaextlc1_args(
     results_dir: Path, analysis_dir: Path, lc_name: str, bin_size: str, pculist: str,
 ) -> List[str]:
@@ -134,12 +127,9 @@ def _run_pcaextlc(
             pass
 
 
-def _enumerate_results(root_dir: Path) -> List[Path]:
-    return [e for e in sorted(root_dir.iterdir()) if _is_results_dir_for_obsid(e)]
-
-
 def _check_inputs(results_dir: Path, list_files: List[str]) -> bool:
-    """Verify per-obsid input files exist; return True if all present, else log + False."""
+    """Verify per-obsid input files exist (and the .lis lists are non-empty); return True
+    if all present, else log + False."""
     obsid = results_dir.name[:-len('-results')]
     analysis = results_dir / 'Analysis'
     if not analysis.is_dir():
@@ -149,63 +139,52 @@ def _check_inputs(results_dir: Path, list_files: List[str]) -> bool:
         logger.warning(f"{obsid}: missing Analysis/good.gti; run 'filter' first")
         return False
     for lf in list_files:
-        if not (results_dir / lf).exists():
+        # An empty .lis (no files of that mode in this obsid) would only make
+        # pcaextlc fail after a fork+exec; treat it like a missing one.
+        try:
+            empty = (results_dir / lf).stat().st_size == 0
+        except FileNotFoundError:
             logger.warning(f"{obsid}: missing {lf}; run 'prepare' first")
             return False
+        if empty:
+            logger.info(f"SKIP {obsid} ({lf} is empty)")
+            return False
     return True
 
 
-def extract_std1_lightcurves(
-    root_dir: Optional[Path] = None,
-    bin_size: Optional[str] = None,
-    lc_name: Optional[str] = None,
-    pculist: Optional[str] = None,
-    workers: Optional[int] = None,
-    skip_existing: Optional[bool] = None,
-    interactive: bool = True,
+def _run_lightcurve_tasks(
+    root_dir: Path,
+    label: str,
+    list_files: List[str],
+    lc_name: str,
+    build_cmd: Callable[[Path, Path], List[str]],
+    workers: int,
+    skip_existing: bool,
 ):
-    """Generate STD1 light curves with pcaextlc1."""
-    require_heasoft_tool('pcaextlc1')
-
-    if interactive:
-        root_dir = get_path("Root directory", Path('.'), root_dir)
-        bin_size = get_input("Bin size (seconds)", "0.125", bin_size)
-        lc_name = get_input("Output LC filename", DEFAULT_STD1_LC_NAME, lc_name)
-        pculist = get_input("PCU list (comma-sep)", "2", pculist)
-        workers = get_int("Parallel workers", multiprocessing.cpu_count(), workers)
-        skip_existing = get_yes_no(
-            f"Skip obsids whose Analysis/{lc_name} already exists?", True, skip_existing
-        )
-    else:
-        root_dir = root_dir or Path('.')
-        bin_size = bin_size or "0.125"
-        lc_name = lc_name or DEFAULT_STD1_LC_NAME
-        pculist = pculist or "2"
-        workers = workers or multiprocessing.cpu_count()
-        skip_existing = skip_existing if skip_existing is not None else True
-
-    if not root_dir.is_dir():
-        raise ValueError(f"Root directory does not exist: {root_dir}")
+    """Shared driver for the STD1/STD2 extractors.
 
+    Scans root_dir once, skips obsids with missing inputs or (optionally) an
+    existing lc_name, and runs `build_cmd(results_dir, analysis)` for the
+    rest on a thread pool via _run_pcaextlc.
+    """
     seext_cwd = root_dir.parent.resolve()
 
     tasks: List[Tuple[Path, List[str], Path]] = []
-    for results_dir in _enumerate_results(root_dir):
-        if not _check_inputs(results_dir, ['FP_dtstd1.lis', 'FP_dtbkg2.lis']):
+    for results_dir in find_results_dirs(root_dir):
+        if not _check_inputs(results_dir, list_files):
             continue
         analysis = results_dir / 'Analysis'
         lc_path = analysis / lc_name
         if skip_existing and lc_path.exists() and lc_path.stat().st_size > 0:
             logger.info(f"SKIP {results_dir.name[:-len('-results')]} ({lc_name})")
             continue
-        cmd = _build_pcaextlc1_args(results_dir, analysis, lc_name, bin_size, pculist)
-        tasks.append((results_dir, cmd, lc_path))
+        tasks.append((results_dir, build_cmd(results_dir, analysis), lc_path))
 
     if not tasks:
         logger.warning("No work to do.")
         return
 
-    logger.info(f"Building {len(tasks)} STD1 lightcurves with {workers} workers")
+    logger.info(f"Building {len(tasks)} {label} lightcurves with {workers} workers")
     failures = 0
     with ThreadPoolExecutor(max_workers=workers) as executor:
         futures = {
@@ -225,7 +204,46 @@ def extract_std1_lightcurves(
     if failures:
         logger.warning(f"Done with {failures}/{len(tasks)} failures.")
     else:
-        logger.info(f"Done. Built {len(tasks)} STD1 lightcurves.")
+        logger.info(f"Done. Built {len(tasks)} {label} lightcurves.")
+
+
+def extract_std1_lightcurves(
+    root_dir: Optional[Path] = None,
+    bin_size: Optional[str] = None,
+    lc_name: Optional[str] = None,
+    pculist: Optional[str] = None,
+    workers: Optional[int] = None,
+    skip_existing: Optional[bool] = None,
+    interactive: bool = True,
+):
+    """Generate STD1 light curves with pcaextlc1."""
+    require_heasoft_tool('pcaextlc1')
+
+    if interactive:
+        root_dir = get_path("Root directory", Path('.'), root_dir)
+        bin_size = get_input("Bin size (seconds)", "0.125", bin_size)
+        lc_name = get_input("Output LC filename", DEFAULT_STD1_LC_NAME, lc_name)
+        pculist = get_input("PCU list (comma-sep)", "2", pculist)
+        workers = get_int("Parallel workers", multiprocessing.cpu_count(), workers)
+        skip_existing = get_yes_no(
+            f"Skip obsids whose Analysis/{lc_name} already exists?", True, skip_existing
+        )
+    else:
+        root_dir = root_dir or Path('.')
+        bin_size = bin_size or "0.125"
+        lc_name = lc_name or DEFAULT_STD1_LC_NAME
+        pculist = pculist or "2"
+        workers = workers or multiprocessing.cpu_count()
+        skip_existing = skip_existing if skip_existing is not None else True
+
+    if not root_dir.is_dir():
+        raise ValueError(f"Root directory does not exist: {root_dir}")
+
+    _run_lightcurve_tasks(
+        root_dir, 'STD1', ['FP_dtstd1.lis', 'FP_dtbkg2.lis'], lc_name,
+        lambda d, a: _build_pcaextlc1_args(d, a, lc_name, bin_size, pculist),
+        workers, skip_existing,
+    )
 
 
 def extract_std2_lightcurves(
@@ -269,47 +287,13 @@ def extract_std2_lightcurves(
     if not root_dir.is_dir():
         raise ValueError(f"Root directory does not exist: {root_dir}")
 
-    seext_cwd = root_dir.parent.resolve()
-
-    tasks: List[Tuple[Path, List[str], Path]] = []
-    for results_dir in _enumerate_results(root_dir):
-        if not _check_inputs(results_dir, ['FP_dtstd2.lis', 'FP_dtbkg2.lis']):
-            continue
-        analysis = results_dir / 'Analysis'
-        lc_path = analysis / lc_name
-        if skip_existing and lc_path.exists() and lc_path.stat().st_size > 0:
-            logger.info(f"SKIP {results_dir.name[:-len('-results')]} ({lc_name})")
-            continue
-        cmd = _build_pcaextlc2_args(
-            results_dir, analysis, lc_name, layerlist, time_bins, pculist, chmin, chmax,
-        )
-        tasks.append((results_dir, cmd, lc_path))
-
-    if not tasks:
-        logger.warning("No work to do.")
-        return
-
-    logger.info(f"Building {len(tasks)} STD2 lightcurves with {workers} workers")
-    failures = 0
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        futures = {
-            executor.submit(_run_pcaextlc, c, d, p, seext_cwd): d
-            for d, c, p in tasks
-        }
-        for fut in as_completed(futures):
-            try:
-                logger.info(f"OK   {fut.result()}")
-            except HEASoftToolError:
-                failures += 1
-            except Exception as e:
-                d = futures[fut]
-                logger.error(f"FAIL {d.name}: {type(e).__name__}: {e}")
-                failures += 1
-
-    if failures:
-        logger.warning(f"Done with {failures}/{len(tasks)} failures.")
-    else:
-        logger.info(f"Done. Built {len(tasks)} STD2 lightcurves.")
+    _run_lightcurve_tasks(
+        root_dir, 'STD2', ['FP_dtstd2.lis', 'FP_dtbkg2.lis'], lc_name,
+        lambda d, a: _build_pcaextlc2_args(
+            d, a, lc_name, layerlist, time_bins, pculist, chmin, chmax,
+        ),
+        workers, skip_existing,
+    )
 
 
 def generate_lightcurves(
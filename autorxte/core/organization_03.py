@@ -17,6 +17,7 @@ import csv
 import gzip
 import logging
 import multiprocessing
+import os
 import re
 import shutil
 from pathlib import Path
@@ -153,15 +154,22 @@ def organize_single_obsid(
         _write_god(obsid_dir / SP_GOD, sp_entries)
 
     # Move (or copy) the god files into Analysis/.
-    transfer = shutil.move if move_mode else shutil.copy2
     for god_name, made in [(SE_GOD, bool(se_entries)), (SP_GOD, bool(sp_entries))]:
         if not made:
             continue
         src = obsid_dir / god_name
         dst = analysis_dir / god_name
+        if move_mode:
+            try:
+                # <obsid>/ and <obsid>-results/ are siblings, so this is
+                # normally a single rename that also replaces a stale dst.
+                os.replace(src, dst)
+                continue
+            except OSError:
+                pass
         if dst.exists():
             dst.unlink()
-        transfer(str(src), str(dst))
+        (shutil.move if move_mode else shutil.copy2)(str(src), str(dst))
 
     n_se, n_sp = len(se_entries), len(sp_entries)
     logger.info(f"OK   {obsid}  (SE={n_se} SP={n_sp})")
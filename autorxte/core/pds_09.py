@@ -13,21 +13,18 @@ DISPLAY. The .fps and .pha outputs are what downstream analysis cares
 about; pass --plot-device <dev>/png to also save a PNG of the spectrum.
 """
 import logging
-import multiprocessing
-import re
-import shutil
-import tempfile
+import os
 from pathlib import Path
 from typing import Optional, List
 
-from autorxte.utils import run_heasoft_pty, HEASoftToolError, require_heasoft_tool
+from autorxte.utils import (
+    run_heasoft_pty, HEASoftToolError, require_heasoft_tool, find_results_dirs,
+)
 from autorxte.utils.interactive import get_path, get_input, get_int, get_yes_no
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 logger = logging.getLogger(__name__)
 
-OBSID_RE = re.compile(r'^\d{5}-\d{2}-\d{2}-\d{2}[A-Z]?$')
-
 # Default output names (in Analysis/).
 DEFAULT_LC = "event.lc"
 PDS_FPS = "pds.fps"
@@ -37,12 +34,6 @@ PDS_SRC = "pds-src.pha"
 PDS_RSP = "pds-rsp.pha"
 
 
-def _is_results_dir_for_obsid(entry: Path) -> bool:
-    if not entry.is_dir() or not entry.name.endswith('-results'):
-        return False
-    return bool(OBSID_RE.match(entry.name[:-len('-results')]))
-
-
 def _run_powspec(
     analysis: Path, lc_file: str, binning: str, rebin: str, plot_device: str,
 ):
@@ -76,6 +67,7 @@ def _run_powspec(
         cwd=analysis,
         timeout=600,
         must_exist=[fps_path],
+        keep_output=False,
     )
 
 
@@ -101,17 +93,14 @@ def _run_fplot(analysis: Path):
         cwd=analysis,
         timeout=120,
         must_exist=[qdp_path],
+        keep_output=False,
     )
 
 
-def _qdp_to_dat(analysis: Path):
-    """Transform QDP (FREQ ERR_F POWER ERR_P) into the 4-column format flx2xsp wants:
-       lo  hi  rate  err
-    where lo = freq - half-bin, hi = freq + half-bin.
-    """
-    qdp_path = analysis / PDS_QDP
-    dat_path = analysis / PDS_DAT
-    with qdp_path.open() as fin, dat_path.open('w') as fout:
+def _qdp_rows(qdp_path: Path):
+    """Yield (freq, err_f, power, err_p) for every QDP data row that parses,
+    skipping the 3-line header and any short or non-numeric lines."""
+    with qdp_path.open() as fin:
         for i, line in enumerate(fin):
             if i < 3:
                 continue  # QDP header
@@ -119,10 +108,30 @@ def _qdp_to_dat(analysis: Path):
             if len(parts) < 4:
                 continue
             try:
-                f, df, p, dp = (float(x) for x in parts[:4])
+                yield tuple(float(x) for x in parts[:4])
             except ValueError:
                 continue
-            fout.write(f"{f - df} {f + df} {p} {dp}\n")
+
+
+def _qdp_to_dat(analysis: Path):
+    """Transform QDP (FREQ ERR_F POWER ERR_P) into the 4-column format flx2xsp wants:
+       lo  hi  rate  err
+    where lo = freq - half-bin, hi = freq + half-bin.
+    """
+    import numpy as np
+
+    qdp_path = analysis / PDS_QDP
+    dat_path = analysis / PDS_DAT
+    try:
+        # Normal fplot dump: header then purely numeric rows, parsed in C.
+        arr = np.loadtxt(qdp_path, skiprows=3, usecols=(0, 1, 2, 3), ndmin=2)
+    except ValueError:
+        # Stray non-numeric or short lines (e.g. "NO" group separators):
+        # keep the rows that parse, as the line-by-line reader always did.
+        arr = np.array(list(_qdp_rows(qdp_path)), dtype=float)
+    f, df, p, dp = arr.reshape(-1, 4).T
+    # '%s' keeps the shortest round-trip repr of each value.
+    np.savetxt(dat_path, np.column_stack([f - df, f + df, p, dp]), fmt='%s')
 
 
 def _run_flx2xsp(analysis: Path):
@@ -146,6 +155,7 @@ def _run_flx2xsp(analysis: Path):
         cwd=analysis,
         timeout=60,
         must_exist=[src_path, rsp_path],
+        keep_output=False,
     )
 
 
@@ -199,7 +209,7 @@ def compute_pds(
             "PGPLOT plot device (/null = headless, e.g. pds.png/png to save)",
             "/null", plot_device,
         )
-        workers = get_int("Parallel workers", multiprocessing.cpu_count(), workers)
+        workers = get_int("Parallel workers", (os.cpu_count() or 1), workers)
         skip_existing = get_yes_no(
             f"Skip obsids whose Analysis/{PDS_SRC} already exists?", True, skip_existing
         )
@@ -209,16 +219,14 @@ def compute_pds(
         binning = binning or "-1"
         rebin = rebin or "-1.03"
         plot_device = plot_device or "/null"
-        workers = workers or multiprocessing.cpu_count()
+        workers = workers or (os.cpu_count() or 1)
         skip_existing = skip_existing if skip_existing is not None else True
 
     if not root_dir.is_dir():
         raise ValueError(f"Root directory does not exist: {root_dir}")
 
     tasks: List[Path] = []
-    for results_dir in sorted(root_dir.iterdir()):
-        if not _is_results_dir_for_obsid(results_dir):
-            continue
+    for results_dir in find_results_dirs(root_dir):
         analysis = results_dir / "Analysis"
         if not analysis.is_dir():
             logger.warning(f"{results_dir.name[:-len('-results')]}: no Analysis/; skip")
@@ -1,7 +1,7 @@
 """02 - Observation Preparation with pcaprepobsid."""
 import logging
+import os
 import re
-import multiprocessing
 from pathlib import Path
 from typing import Optional, List
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -78,11 +78,11 @@ def prepare_all_obsids(root_dir: Optional[Path] = None, workers: Optional[int] =
 
     if interactive:
         root_dir = get_path("Root directory", Path('.'), root_dir)
-        workers = get_int("Parallel workers", multiprocessing.cpu_count(), workers)
+        workers = get_int("Parallel workers", (os.cpu_count() or 1), workers)
         skip_existing = get_yes_no("Skip existing results?", True, skip_existing)
     else:
         root_dir = root_dir or Path('.')
-        workers = workers or multiprocessing.cpu_count()
+        workers = workers or (os.cpu_count() or 1)
         skip_existing = skip_existing if skip_existing is not None else True
 
     if not root_dir.is_dir():
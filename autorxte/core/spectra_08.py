@@ -13,31 +13,24 @@ moving the three output files into Analysis/ afterwards.
 """
 import logging
 import multiprocessing
-import re
 import shutil
 import tempfile
 from pathlib import Path
 from typing import Optional, List, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from autorxte.utils import run_heasoft_pty, HEASoftToolError, require_heasoft_tool
+from autorxte.utils import (
+    run_heasoft_pty, HEASoftToolError, require_heasoft_tool, find_results_dirs,
+)
 from autorxte.utils.interactive import get_path, get_input, get_int, get_yes_no
 
 logger = logging.getLogger(__name__)
 
-OBSID_RE = re.compile(r'^\d{5}-\d{2}-\d{2}-\d{2}[A-Z]?$')
-
 DEFAULT_SRC = "src.pha"
 DEFAULT_BKG = "bkg.pha"
 DEFAULT_RSP = "rsp.pha"
 
 
-def _is_results_dir_for_obsid(entry: Path) -> bool:
-    if not entry.is_dir() or not entry.name.endswith('-results'):
-        return False
-    return bool(OBSID_RE.match(entry.name[:-len('-results')]))
-
-
 def _check_inputs(results_dir: Path) -> bool:
     obsid = results_dir.name[:-len('-results')]
     analysis = results_dir / 'Analysis'
@@ -48,9 +41,16 @@ def _check_inputs(results_dir: Path) -> bool:
         logger.warning(f"{obsid}: missing Analysis/good.gti; run 'filter' first")
         return False
     for lf in ('FP_dtstd2.lis', 'FP_dtbkg2.lis', 'FP_xtefilt.lis'):
-        if not (results_dir / lf).exists():
+        # An empty .lis would only make pcaextspect2 fail after a fork+exec;
+        # treat it like a missing one.
+        try:
+            empty = (results_dir / lf).stat().st_size == 0
+        except FileNotFoundError:
             logger.warning(f"{obsid}: missing {lf}; run 'prepare' first")
             return False
+        if empty:
+            logger.info(f"SKIP {obsid} ({lf} is empty)")
+            return False
     return True
 
 
@@ -167,9 +167,7 @@ def extract_spectra(
     seext_cwd = root_dir.parent.resolve()
 
     tasks: List[Path] = []
-    for results_dir in sorted(root_dir.iterdir()):
-        if not _is_results_dir_for_obsid(results_dir):
-            continue
+    for results_dir in find_results_dirs(root_dir):
         if not _check_inputs(results_dir):
             continue
         analysis = results_dir / 'Analysis'
@@ -1,11 +1,37 @@
-"""Utility modules."""
-from autorxte.utils.fits_utils import split_gti
+"""Utility modules.
+
+split_gti is imported on first access (PEP 562): every pipeline step
+imports this package for the subprocess helpers, and fits_utils would
+otherwise pull in astropy for all of them.
+"""
+import importlib
+
+from autorxte.utils.path_utils import find_results_dirs
 from autorxte.utils.subprocess_utils import (
     run_heasoft_tool, run_heasoft_pty, require_heasoft_tool, HEASoftToolError,
 )
 from autorxte.utils.interactive import get_input, get_yes_no, get_path
+
+# Public name -> submodule that defines it, for the lazily imported names.
+_LAZY = {
+    'split_gti': 'fits_utils',
+}
+
 __all__ = [
-    'split_gti',
+    'split_gti', 'find_results_dirs',
     'run_heasoft_tool', 'run_heasoft_pty', 'require_heasoft_tool', 'HEASoftToolError',
     'get_input', 'get_yes_no', 'get_path',
 ]
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
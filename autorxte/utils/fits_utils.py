@@ -1,9 +1,10 @@
 """FITS file utilities shared across autorxte."""
 
 import logging
+import threading
 from pathlib import Path
 from typing import List
-from astropy.io import fits
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +28,8 @@ def split_gti(gti_path: Path, output_dir: Path) -> List[Path]:
         FileNotFoundError: If gti_path doesn't exist
         ValueError: If GTI file is invalid or has wrong structure
     """
+    from astropy.io import fits
+
     if not gti_path.exists():
         raise FileNotFoundError(f"GTI file not found: {gti_path}")
     
@@ -47,27 +50,31 @@ def split_gti(gti_path: Path, output_dir: Path) -> List[Path]:
                 return existing
             
             logger.info(f"Splitting GTI into {n_rows} individual files")
-            output_files = []
             
-            for idx, row in enumerate(data, start=1):
-                # Create columns for single-row GTI
-                cols = [
-                    fits.Column(
-                        name=col.name,
-                        format=col.format,
-                        array=[row[col.name]]
-                    )
-                    for col in hdul[1].columns
-                ]
-                
-                # Create new HDU with single row
-                tbl = fits.BinTableHDU.from_columns(cols, header=hdul[1].header)
-                hdu_list = fits.HDUList([hdul[0], tbl])
-                
-                # Write to file
+            # Each output is a one-row slice (a view) of the input table
+            # written under the input's own extension header; astropy fixes
+            # NAXIS2 from the slice on write, so no Columns are rebuilt.
+            # The headers come from a file astropy just read, so the
+            # per-write verification pass is skipped.
+            ext_header = hdul[1].header
+            # One detached copy of the primary HDU per worker thread, reused
+            # for every row that thread writes: writeto may touch the
+            # primary header (EXTEND), so threads must not share one.
+            local = threading.local()
+            
+            def write_row(idx: int) -> Path:
+                primary = getattr(local, 'primary', None)
+                if primary is None:
+                    primary = local.primary = hdul[0].copy()
+                tbl = fits.BinTableHDU(data=data[idx - 1:idx], header=ext_header)
+                hdu_list = fits.HDUList([primary, tbl])
                 out_path = output_dir / f"good_{idx}.gti"
-                hdu_list.writeto(out_path, overwrite=True)
-                output_files.append(out_path)
+                hdu_list.writeto(out_path, overwrite=True, output_verify='ignore')
+                return out_path
+            
+            # The files are independent and the work is mostly write I/O.
+            with ThreadPoolExecutor(max_workers=min(8, n_rows) or 1) as executor:
+                output_files = list(executor.map(write_row, range(1, n_rows + 1)))
             
             logger.info(f"Created {len(output_files)} GTI files")
             return output_files
@@ -88,6 +95,8 @@ def validate_fits_file(fits_path: Path, required_extensions: List[str] = None) -
     Returns:
         True if valid, False otherwise
     """
+    from astropy.io import fits
+
     try:
         with fits.open(fits_path) as hdul:
             if required_extensions:
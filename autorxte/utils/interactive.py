@@ -1,17 +1,43 @@
 """Interactive input utilities with fallback to function arguments."""
 
-import glob
+import os
 from pathlib import Path
 from typing import Optional, List, Any
 
 
+def _path_matches(text: str) -> List[str]:
+    """Entries of text's directory whose names start with its basename.
+
+    One scandir of that directory; the text is matched literally (no glob
+    metacharacters), and dotfiles are only offered once a '.' is typed.
+    """
+    dirname, base = os.path.split(text)
+    try:
+        with os.scandir(dirname or '.') as it:
+            names = [
+                e.name for e in it
+                if e.name.startswith(base)
+                and (base.startswith('.') or not e.name.startswith('.'))
+            ]
+    except OSError:
+        return []
+    return [os.path.join(dirname, name) for name in sorted(names)]
+
+
 # Enable bash-style tab completion if available
 try:
     import readline
     readline.parse_and_bind("tab: complete")
     
+    # readline calls the completer with state=0, 1, 2, ... for one tab press;
+    # list the directory once per press (state 0), not once per state, so a
+    # later press still sees files created or removed in between.
+    _completions: List[str] = []
+    
     def path_completer(text, state):
-        matches = glob.glob(text + "*")
+        if state == 0:
+            _completions[:] = _path_matches(text)
+        matches = _completions
         return matches[state] if state < len(matches) else None
     
     readline.set_completer(path_completer)
@@ -19,6 +45,23 @@ except ImportError:
     pass
 
 
+def _ask(text: str, has_default: bool) -> str:
+    """input() that treats a closed stdin as "take the default".
+
+    Piped answers (`printf '...' | autorxte ...`) are still read line by
+    line; once they run out, prompts with a default use it instead of the
+    run dying on EOFError, and prompts without one fail with a clear message.
+    """
+    try:
+        return input(text).strip()
+    except EOFError:
+        if not has_default:
+            raise EOFError(f"No input for {text.rstrip(': ')!r}: stdin is closed "
+                           f"and there is no default") from None
+        print()
+        return ''
+
+
 def get_input(
     prompt: str,
     default: Optional[Any] = None,
@@ -43,25 +86,25 @@ def get_input(
     if arg_value is not None:
         return arg_value
     
-    # Otherwise, prompt interactively
+    # Otherwise, prompt interactively until the input converts and validates
     default_str = f" [{default}]" if default is not None else ""
-    user_input = input(f"{prompt}{default_str}: ").strip()
-    
-    if not user_input and default is not None:
-        return default
-    
-    if not user_input:
-        return None
-    
-    # Convert and validate
-    try:
-        value = converter(user_input)
-        if validator:
-            validator(value)
-        return value
-    except (ValueError, TypeError) as e:
-        print(f"Invalid input: {e}")
-        return get_input(prompt, default, None, converter, validator)
+    while True:
+        user_input = _ask(f"{prompt}{default_str}: ", default is not None)
+        
+        if not user_input and default is not None:
+            return default
+        
+        if not user_input:
+            return None
+        
+        # Convert and validate
+        try:
+            value = converter(user_input)
+            if validator:
+                validator(value)
+            return value
+        except (ValueError, TypeError) as e:
+            print(f"Invalid input: {e}")
 
 
 def get_yes_no(prompt: str, default: bool = False, arg_value: Optional[bool] = None) -> bool:
@@ -70,7 +113,7 @@ def get_yes_no(prompt: str, default: bool = False, arg_value: Optional[bool] = N
         return arg_value
     
     default_str = " [y/n]" if default is None else f" [{'y' if default else 'n'}]"
-    response = input(f"{prompt}{default_str}: ").strip().lower()
+    response = _ask(f"{prompt}{default_str}: ", default is not None).lower()
     
     if not response and default is not None:
         return default
@@ -84,7 +127,7 @@ def get_path(prompt: str, default: Optional[Path] = None, arg_value: Optional[Pa
         return Path(arg_value)
     
     default_str = f" [{default}]" if default is not None else ""
-    user_input = input(f"{prompt}{default_str}: ").strip()
+    user_input = _ask(f"{prompt}{default_str}: ", default is not None)
     
     if not user_input and default is not None:
         return Path(default)
@@ -148,7 +191,7 @@ def get_choice(
     default_str = f" [{default}]" if default else ""
     
     while True:
-        user_input = input(f"{prompt} ({choices_str}){default_str}: ").strip().lower()
+        user_input = _ask(f"{prompt} ({choices_str}){default_str}: ", bool(default)).lower()
         
         if not user_input and default:
             return default
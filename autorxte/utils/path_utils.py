@@ -0,0 +1,32 @@
+"""Directory discovery shared across the pipeline stages."""
+
+import os
+import re
+from pathlib import Path
+from typing import List
+
+# RXTE ObsID format: PPPPP-NN-NN-NN with optional trailing letter (revision tag).
+OBSID_RE = re.compile(r'^\d{5}-\d{2}-\d{2}-\d{2}[A-Z]?$')
+
+
+def find_results_dirs(root_dir: Path) -> List[Path]:
+    """
+    List the <obsid>-results directories under root_dir.
+
+    Uses a single os.scandir pass. DirEntry caches the file type from
+    readdir, so is_dir() is only evaluated for names that already match and
+    normally costs no extra stat; symlinked results dirs are still followed.
+
+    Args:
+        root_dir: Directory holding the <obsid>/ and <obsid>-results/ dirs
+
+    Returns:
+        Sorted list of results directory paths
+    """
+    with os.scandir(root_dir) as it:
+        return sorted(
+            Path(e.path) for e in it
+            if e.name.endswith('-results')
+            and OBSID_RE.match(e.name[:-len('-results')])
+            and e.is_dir()
+        )
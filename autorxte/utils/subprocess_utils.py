@@ -1,17 +1,34 @@
 """Subprocess utilities for running HEASoft tools safely."""
 
+import functools
 import logging
 import os
 import pty
 import select
 import subprocess
 import shutil
+import sys
 from pathlib import Path
-from typing import List, Optional, Dict, Tuple
+from typing import List, Optional, Dict, Tuple, Union
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
+# Pipe buffer size asked for when capturing a tool's output (Python 3.10+).
+# A chatty tool then fills the pipe in far fewer round trips through
+# communicate(). Unprivileged processes can't exceed pipe-max-size.
+_PIPE_SIZE = 1 << 20
+try:
+    with open('/proc/sys/fs/pipe-max-size') as _f:
+        _PIPE_SIZE = min(_PIPE_SIZE, int(_f.read()))
+except (OSError, ValueError):
+    pass
+
+# Output run_heasoft_pty keeps when the caller doesn't need the full
+# transcript: enough for the closing "terminating with status" line and the
+# error context it reports.
+_PTY_TAIL_BYTES = 64 * 1024
+
 
 class HEASoftToolError(Exception):
     """Raised when a HEASoft tool execution fails."""
@@ -31,9 +48,14 @@ def check_heasoft_tool(tool_name: str) -> bool:
     return shutil.which(tool_name) is not None
 
 
+@functools.lru_cache(maxsize=None)
 def require_heasoft_tool(tool_name: str):
     """
     Check if a HEASoft tool exists, raise error if not.
+
+    Successful lookups are cached for the life of the process, so the
+    per-task check in run_heasoft_tool/run_heasoft_pty does not rescan PATH.
+    A missing tool raises and is therefore looked up again on the next call.
     
     Args:
         tool_name: Name of the tool
@@ -81,6 +103,9 @@ def run_heasoft_tool(
     
     logger.debug(f"Running {tool_name} with {len(script_lines)} input lines")
     
+    # subprocess.run drains stdout and stderr concurrently (communicate), so
+    # large outputs can't deadlock; a bigger pipe just means fewer wakeups.
+    extra = {'pipesize': _PIPE_SIZE} if sys.version_info >= (3, 10) else {}
     try:
         result = subprocess.run(
             [tool_name],
@@ -90,7 +115,8 @@ def run_heasoft_tool(
             cwd=cwd,
             env=env,
             timeout=timeout,
-            check=True
+            check=True,
+            **extra
         )
         logger.debug(f"{tool_name} completed successfully")
         return result
@@ -109,11 +135,12 @@ def run_heasoft_tool(
 
 def run_heasoft_pty(
     cmd: List[str],
-    input_text: Optional[str] = None,
+    input_text: Optional[Union[str, bytes]] = None,
     cwd: Optional[Path] = None,
     env: Optional[Dict] = None,
     timeout: Optional[int] = None,
     must_exist: Optional[List[Path]] = None,
+    keep_output: bool = True,
 ) -> Tuple[int, str]:
     """Run a HEASoft tool under a pseudo-terminal.
 
@@ -137,11 +164,16 @@ def run_heasoft_pty(
         cmd: Full argv list, e.g. ['pcaprepobsid', 'indir=...', 'outdir=...', 'mode=h']
         input_text: Lines to send on stdin (must end each line with \\n).
             For tools that read parameter values one-per-line (maketime, etc.).
+            A str is encoded once up front; bytes are sent as-is.
         cwd: Working directory.
         env: Environment dict (default: inherit).
         timeout: Seconds before killing the child (default: no timeout).
         must_exist: Paths that must exist after the call. If any are
             missing, raise HEASoftToolError (catches silent failures).
+        keep_output: If False, the pty is still drained but only the last
+            _PTY_TAIL_BYTES of output are kept (and returned). For callers
+            that never parse the transcript, this avoids buffering and
+            decoding everything a chatty tool prints.
 
     Returns:
         (returncode, combined_output_text)
@@ -186,17 +218,43 @@ def run_heasoft_pty(
         os.close(slave_fd)
         slave_fd = -1
 
-        # If we have stdin lines to send, write them up-front. Tools that read
-        # interactively will consume them line by line. Small inputs fit in the
-        # pty buffer; larger ones may need chunked writes (not relevant for
-        # parameter-style input, which is at most a few kB).
+        # Stdin lines are encoded once and fed to the pty as it has room:
+        # parameter-style input usually fits in one write, and anything larger
+        # is sent in pieces from the read loop below (memoryview slices, no
+        # copies) instead of blocking while the child waits on its output.
+        os.set_blocking(master_fd, False)
+        pending = None
         if input_text:
+            pending = memoryview(
+                input_text if isinstance(input_text, bytes) else input_text.encode()
+            )
+
+        def _write_pending():
+            nonlocal pending
             try:
-                os.write(master_fd, input_text.encode())
+                n = os.write(master_fd, pending)
+            except BlockingIOError:
+                return
             except OSError as e:
                 logger.debug(f"Could not write stdin to pty: {e}")
+                pending = None
+                return
+            pending = pending[n:] if n < len(pending) else None
+
+        if pending is not None:
+            _write_pending()
 
         chunks: List[bytes] = []
+        kept = 0
+
+        def _keep(data: bytes):
+            nonlocal kept
+            chunks.append(data)
+            kept += len(data)
+            if not keep_output:
+                while len(chunks) > 1 and kept - len(chunks[0]) >= _PTY_TAIL_BYTES:
+                    kept -= len(chunks.pop(0))
+
         import time
         start = time.monotonic()
         while True:
@@ -205,15 +263,21 @@ def run_heasoft_pty(
                 proc.wait()
                 raise subprocess.TimeoutExpired(cmd, timeout)
             # Wait up to 1s for output, then re-check timeout/exit.
-            r, _, _ = select.select([master_fd], [], [], 1.0)
+            r, w, _ = select.select(
+                [master_fd], [master_fd] if pending is not None else [], [], 1.0,
+            )
+            if w:
+                _write_pending()
             if r:
                 try:
                     data = os.read(master_fd, 65536)
+                except BlockingIOError:
+                    continue
                 except OSError:
                     data = b''
                 if not data:
                     break
-                chunks.append(data)
+                _keep(data)
             elif proc.poll() is not None:
                 # Drain any remaining output then exit.
                 while True:
@@ -222,11 +286,13 @@ def run_heasoft_pty(
                         break
                     try:
                         data = os.read(master_fd, 65536)
+                    except BlockingIOError:
+                        break
                     except OSError:
                         data = b''
                     if not data:
                         break
-                    chunks.append(data)
+                    _keep(data)
                 break
 
         proc.wait()
@@ -282,10 +348,15 @@ def run_heasoft_pty(
 def temporary_script(script_lines: List[str], script_path: Path):
     """
     Context manager for creating temporary script files.
+
+    On Linux the script lives in an anonymous memfd and the yielded path is
+    its /proc/<pid>/fd entry, so nothing touches the filesystem; a child
+    process can open that path too. Elsewhere (or if memfd_create fails) the
+    script is written to script_path and removed afterwards.
     
     Args:
         script_lines: Lines to write to script
-        script_path: Path for temporary script file
+        script_path: Path for temporary script file (fallback only)
         
     Yields:
         Path to the script file
@@ -294,11 +365,32 @@ def temporary_script(script_lines: List[str], script_path: Path):
         with temporary_script(lines, Path('temp.txt')) as script:
             subprocess.run(['tool'], stdin=script.open('r'))
     """
+    data = ('\n'.join(script_lines) + '\n').encode()
+
+    fd = -1
+    if hasattr(os, 'memfd_create'):
+        try:
+            fd = os.memfd_create(script_path.name or 'heasoft_script')
+        except OSError:
+            fd = -1
+
+    if fd != -1:
+        try:
+            os.write(fd, data)
+            path = Path(f'/proc/{os.getpid()}/fd/{fd}')
+            logger.debug(f"Created in-memory script: {path}")
+            yield path
+        finally:
+            os.close(fd)
+        return
+
     try:
-        script_path.write_text('\n'.join(script_lines) + '\n')
+        script_path.write_bytes(data)
         logger.debug(f"Created temporary script: {script_path}")
         yield script_path
     finally:
-        if script_path.exists():
+        try:
             script_path.unlink()
             logger.debug(f"Cleaned up temporary script: {script_path}")
+        except FileNotFoundError:
+            pass
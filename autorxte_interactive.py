@@ -5,9 +5,13 @@ import sys
 from pathlib import Path
 
 def clear():
-    """Clear screen"""
+    """Clear screen (ANSI home + erase; no subshell except on Windows)"""
     import os
-    os.system('cls' if os.name == 'nt' else 'clear')
+    if os.name == 'nt':
+        os.system('cls')
+    elif sys.stdout.isatty():
+        sys.stdout.write('\x1b[H\x1b[2J')
+        sys.stdout.flush()
 
 def show_menu():
     """Show main menu"""
@@ -0,0 +1,49 @@
+"""Tests for XSPEC log parsing."""
+import random
+
+import pytest
+
+from autorxte.advanced.xspec_fit_02 import (
+    _RE_CHI2, _RE_DOF, _RE_FLUX, _last_match,
+)
+
+_PATTERNS = [
+    (_RE_CHI2, 'Chi-Squared'),
+    (_RE_DOF, 'degrees of freedom'),
+    (_RE_FLUX, 'Flux'),
+]
+
+_FRAGMENTS = [
+    'Chi-Squared', 'Chi-Squared 5945.33', 'using 52 bins.', 'using',
+    'with', 'with 49', '49 degrees of freedom', 'degrees of freedom',
+    'Model Flux 0.02343 photons (1.234e-10 ergs/cm^2/s)', 'Model', 'Flux',
+    'Flux 0.5 photons (2e-11 ergs', '1.25e+3', 'XSPEC12>', 'fit', '+/-',
+]
+
+
+def _naive_last(regex, text):
+    matches = list(regex.finditer(text))
+    return matches[-1] if matches else None
+
+
+def _random_log(rng):
+    parts = []
+    for _ in range(rng.randrange(1, 30)):
+        parts.append(rng.choice(_FRAGMENTS))
+        parts.append(rng.choice([' ', '  ', '\n', ' \n ', '\t']))
+    return ''.join(parts)
+
+
+@pytest.mark.parametrize('regex,literal', _PATTERNS)
+def test_last_match_agrees_with_full_scan(regex, literal):
+    rng = random.Random(literal)
+    for _ in range(5000):
+        text = _random_log(rng)
+        got = _last_match(regex, text, literal)
+        want = _naive_last(regex, text)
+        assert (got and got.span()) == (want and want.span()), text
+
+
+def test_last_match_prefers_later_match_on_same_line():
+    text = 'Chi-Squared 1.0 using Chi-Squared 2.0 using 10 bins.'
+    assert _last_match(_RE_CHI2, text, 'Chi-Squared').group(1) == '2.0'